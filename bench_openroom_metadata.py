@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from playwright.async_api import async_playwright
+
+from main import BROWSER_LAUNCH_ARGS, OPENROOM_FIELDS, OPENROOM_METADATA_JS
+
+# Benchmarks the OpenRoom case-page metadata extraction on the saved pages in
+# fixtures/openroom: the original per-label script against the single-pass
+# OPENROOM_METADATA_JS. Fails if any extracted value differs.
+#
+#   python bench_openroom_metadata.py
+#   python bench_openroom_metadata.py --repeat 50
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "openroom")
+
+LEGACY_METADATA_JS = """
+    () => {
+        const extract = (label) => {
+            const block = Array.from(document.querySelectorAll('div'))
+                .find(el => el.innerText.includes(label));
+            if (!block) return null;
+            const text = block.innerText;
+            return text.split(label)[1]?.trim().split('\\n')[0] || null;
+        };
+        return {
+            tenant: extract('Tenant'),
+            landlord: extract('Landlord'),
+            fileNumber: extract('File Number'),
+            address: extract('Property Address'),
+            topic: extract('Topics'),
+            amountOwed: extract('Amount owed'),
+        };
+    }
+"""
+
+
+async def timed(page, script, arg, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await page.evaluate(script, arg)
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    failures = 0
+    fixtures = sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith(".html"))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
+        page = await browser.new_page()
+        await page.route("**/*", lambda route: route.abort())
+
+        print(f"{'fixture':<28} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}  same")
+        for fixture in fixtures:
+            with open(os.path.join(FIXTURES_DIR, fixture), encoding="utf-8") as f:
+                await page.set_content(f.read(), wait_until="domcontentloaded")
+
+            expected, legacy_ms = await timed(page, LEGACY_METADATA_JS, None, args.repeat)
+            result, new_ms = await timed(page, OPENROOM_METADATA_JS, OPENROOM_FIELDS, args.repeat)
+
+            same = result["values"] == expected
+            print(f"{fixture:<28} {legacy_ms:>10.2f} {new_ms:>8.2f} {legacy_ms / new_ms:>7.2f}x  {'yes' if same else 'NO'}")
+            if not same:
+                failures += 1
+                print(f"  legacy: {expected}")
+                print(f"  new:    {result['values']}")
+                print(f"  match:  {result['matched']}")
+
+        await browser.close()
+
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(main()) else 0)
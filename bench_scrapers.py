@@ -0,0 +1,208 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from mock_providers import MockProviders, start_mock_server
+
+# End-to-end benchmark of the scrape_* functions against mock_providers.py, so
+# no request leaves the machine. For each provider and concurrency level it
+# runs --iterations searches (each with a new name, so the decision store and
+# upload index start cold) and reports latency, pages per second, peak RSS of
+# this process plus its browsers, and the browser count.
+#
+#   python bench_scrapers.py
+#   python bench_scrapers.py --providers quebec,bc --concurrency 1,4,8 --latency-ms 80
+#   python bench_scrapers.py --json before.json
+#   python bench_scrapers.py --baseline before.json --tolerance 0.2   # exit 1 on regression
+#
+# RSS and process counts are read from /proc, so those columns are Linux only.
+
+
+def process_tree(root_pid: int):
+    # pid -> (ppid, rss_kb, cmdline) for root_pid and all its descendants.
+    # Only sampled during a run, after bench() has imported main.
+    from main import read_processes
+
+    procs = read_processes()
+    tree, frontier = {}, [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        if pid in procs and pid not in tree:
+            tree[pid] = procs[pid]
+            frontier.extend(child for child, info in procs.items() if info[0] == pid)
+    return tree
+
+
+class ResourceSampler:
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak_rss_kb = 0
+        self.peak_browsers = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        if not os.path.isdir("/proc"):
+            return
+        tree = process_tree(os.getpid())
+        self.peak_rss_kb = max(self.peak_rss_kb, sum(info[1] for info in tree.values()))
+        # Chromium browser processes; renderers/GPU/utility carry --type=
+        browsers = sum(1 for _, _, cmd in tree.values() if "chrom" in cmd and "--type=" not in cmd)
+        self.peak_browsers = max(self.peak_browsers, browsers)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def percentile(values, pct: float):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+async def run_case(main, mock, provider: str, concurrency: int, iterations: int, run_id: str):
+    scraper = main.SCRAPERS[provider]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures, cases = [], 0, 0
+
+    async def one(i):
+        nonlocal failures, cases
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                cases += len(await scraper(f"bench {run_id} {provider} c{concurrency} {i}"))
+            except Exception as e:
+                failures += 1
+                print(f"[Bench] {provider} iteration {i} failed: {e}")
+            latencies.append(time.perf_counter() - started)
+
+    before = mock.stats()
+    with ResourceSampler() as sampler:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(iterations)))
+        wall = time.perf_counter() - started
+    after = mock.stats()
+
+    pages = sum(after.get(kind, 0) - before.get(kind, 0) for kind in ("search", "case", "decision"))
+    health = await main.browser_pool.health()
+    return {
+        "provider": provider,
+        "concurrency": concurrency,
+        "iterations": iterations,
+        "failures": failures,
+        "cases": cases,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "pagesPerSecond": pages / wall if wall else 0.0,
+        "peakRssMb": sampler.peak_rss_kb / 1024,
+        "browsers": len(health["browsers"]),
+        "browserProcesses": sampler.peak_browsers,
+    }
+
+
+def compare(results, baseline, tolerance: float):
+    # A regression is p95 up, or pages/s down, by more than the tolerance
+    previous = {(r["provider"], r["concurrency"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = previous.get((r["provider"], r["concurrency"]))
+        if not old:
+            continue
+        if old["p95"] and r["p95"] > old["p95"] * (1 + tolerance):
+            regressions.append(f"{r['provider']} c={r['concurrency']}: p95 {old['p95']:.2f}s -> {r['p95']:.2f}s")
+        if old["pagesPerSecond"] and r["pagesPerSecond"] < old["pagesPerSecond"] * (1 - tolerance):
+            regressions.append(
+                f"{r['provider']} c={r['concurrency']}: pages/s {old['pagesPerSecond']:.1f} -> {r['pagesPerSecond']:.1f}"
+            )
+    return regressions
+
+
+async def bench(args, mock):
+    # main reads its configuration at import time, so import it only after
+    # the environment points at the mock server
+    import main
+
+    results = []
+    run_id = str(int(time.time()))
+    async with main.lifespan(main.app):
+        for provider in args.providers.split(","):
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                results.append(await run_case(main, mock, provider, concurrency, args.iterations, run_id))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", default="ontario,quebec,alberta,bc")
+    parser.add_argument("--concurrency", default="1,4", help="Concurrent searches, comma separated")
+    parser.add_argument("--iterations", type=int, default=8, help="Searches per provider and concurrency level")
+    parser.add_argument("--latency-ms", type=int, default=50, help="Delay the mock adds to every response")
+    parser.add_argument("--results", type=int, default=10, help="Results per search page")
+    parser.add_argument("--pages", type=int, default=3, help="CanLII results pages per search")
+    parser.add_argument("--images", type=int, default=2, help="Court-order images per OpenRoom case")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Compare against results written earlier with --json")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    mock = MockProviders(args.latency_ms, args.results, args.pages, args.images)
+    server, base_url = start_mock_server(mock)
+    workdir = tempfile.mkdtemp(prefix="bench-scrapers-")
+    os.environ.update({
+        "OPENROOM_BASE_URL": base_url,
+        "CANLII_BASE_URL": base_url,
+        "CLOUDINARY_UPLOAD_URL": f"{base_url}/cloudinary/v1_1/mock/image/upload",
+        "DOCUMENT_STORE_PATH": os.path.join(workdir, "decisions.sqlite3"),
+        "UPLOAD_INDEX_PATH": os.path.join(workdir, "uploads.sqlite3"),
+        "STORAGE_STATE_DIR": os.path.join(workdir, "storage_state"),
+    })
+
+    try:
+        results = asyncio.run(bench(args, mock))
+    finally:
+        server.shutdown()
+
+    print(f"\n{'provider':<10} {'conc':>4} {'runs':>5} {'fail':>4} {'cases':>6} {'p50 s':>7} {'p95 s':>7} "
+          f"{'pages/s':>8} {'peak RSS MB':>12} {'browsers':>8} {'procs':>5}")
+    for r in results:
+        print(f"{r['provider']:<10} {r['concurrency']:>4} {r['iterations']:>5} {r['failures']:>4} {r['cases']:>6} "
+              f"{r['p50']:>7.2f} {r['p95']:>7.2f} {r['pagesPerSecond']:>8.1f} {r['peakRssMb']:>12.0f} "
+              f"{r['browsers']:>8} {r['browserProcesses']:>5}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = any(r["failures"] for r in results)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"[Regression] {line}")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
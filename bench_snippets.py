@@ -0,0 +1,143 @@
+import argparse
+import random
+import re
+import sys
+import time
+
+from main import clean_text_preserve_meaning
+
+# Micro-benchmark for the decision snippet extractor. Builds large synthetic
+# French/English judgments, checks that clean_text_preserve_meaning returns
+# exactly what the original two-pass regex version returned, and reports
+# throughput in MB/s for both.
+#
+#   python bench_snippets.py               # default corpus
+#   python bench_snippets.py --sizes 100,500,2000 --repeat 5 --fuzz 2000
+
+FR_WORDS = (
+    "le tribunal locataire locatrice bail loyer logement résiliation expulsion "
+    "preuve audience article somme intérêts indemnité frais dossier mandataire "
+    "présente demande considérant attendu que même comme"
+).split()
+EN_WORDS = (
+    "the tribunal tenant landlord tenancy rent deposit order evidence hearing "
+    "section respondent applicant claim interest fees pursuant therefore "
+    "accordingly same name time some"
+).split()
+
+
+def legacy_clean_text_preserve_meaning(text: str, max_length: int = 10000) -> str:
+    if not text:
+        return ""
+
+    text = re.sub(r'[\n\r\t]+', ' ', text)
+    text = re.sub(r'\s{2,}', ' ', text).strip()
+
+    fr_match = re.search(r"(POUR CES MOTIFS.*?)(Présence|Me\b|Dated|$)", text, re.IGNORECASE)
+    en_match = re.search(r"(Conclusion.*?)(Dated|Signed|Respectfully submitted|$)", text, re.IGNORECASE)
+
+    snippet = None
+
+    if fr_match:
+        start_idx = max(0, fr_match.start() - 1000)
+        snippet = text[start_idx:fr_match.end()]
+    elif en_match:
+        start_idx = max(0, en_match.start() - 1000)
+        snippet = text[start_idx:en_match.end()]
+    else:
+        paragraphs = re.findall(r'\[\d+\][^\[]+', text)
+        snippet = ' '.join(paragraphs[-6:]) if paragraphs else text[-max_length:]
+
+    return snippet.strip()[:max_length] + ("…" if len(snippet) > max_length else "")
+
+
+def paragraph(rng, words, number):
+    sentence = " ".join(rng.choice(words) for _ in range(rng.randint(40, 120)))
+    gap = rng.choice(["\n", "\n\n", "\r\n", "\t", "  ", " \n \t"])
+    return f"[{number}] {sentence}.{gap}"
+
+
+def build_decision(rng, size_kb: int, lang: str, anchor: str):
+    words = FR_WORDS if lang == "fr" else EN_WORDS
+    parts, length, number = [], 0, 1
+    target = size_kb * 1024
+    while length < target:
+        part = paragraph(rng, words, number)
+        parts.append(part)
+        length += len(part)
+        number += 1
+
+    if anchor == "end":
+        marker = "POUR CES MOTIFS, LE TRIBUNAL :\n" if lang == "fr" else "Conclusion and Orders\n"
+        closing = "Présence : la locatrice\nMe Sophie Gagnon" if lang == "fr" else "Dated at Vancouver.\nSigned: Member"
+        parts.insert(max(1, len(parts) - 3), marker)
+        parts.append(closing)
+    elif anchor == "start":
+        parts.insert(1, "POUR CES MOTIFS\n" if lang == "fr" else "Conclusion\n")
+    return "".join(parts)
+
+
+def build_corpus(sizes, seed: int = 7):
+    rng = random.Random(seed)
+    corpus = []
+    for size_kb in sizes:
+        for lang in ("fr", "en"):
+            for anchor in ("end", "start", "none"):
+                corpus.append((f"{lang}-{anchor}-{size_kb}KB", build_decision(rng, size_kb, lang, anchor)))
+    return corpus
+
+
+def fuzz(iterations: int, seed: int = 11):
+    # Short random texts built from the tokens the extractor cares about
+    rng = random.Random(seed)
+    tokens = [
+        "POUR CES MOTIFS", "pour ces motifs", "Conclusion", "CONCLUSION", "Présence", "PRÉSENCE",
+        "Me ", "me", "somme ", "Dated", "Signed", "Respectfully submitted", "[1]", "[23]", "[x]",
+        "[", "]", "\n", "\r\n", "\t", "  ", " ", "\xa0", "\u2003", "\x0b", "texte", "word", "é", "…",
+        "_", "1", "comme", "même ", "\u0130", "\u0131", "\u017f", "MEs", "dAtEd", "mE", "Me_",
+    ]
+    for _ in range(iterations):
+        text = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 60)))
+        max_length = rng.choice([5, 20, 10000])
+        expected = legacy_clean_text_preserve_meaning(text, max_length)
+        actual = clean_text_preserve_meaning(text, max_length)
+        if expected != actual:
+            print(f"[MISMATCH] fuzz input {text!r} (max_length={max_length})")
+            print(f"  legacy: {expected!r}")
+            print(f"  new:    {actual!r}")
+            return False
+    return True
+
+
+def throughput(fn, text: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return len(text.encode("utf-8")) / (1024 * 1024) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,500,2000", help="Decision sizes in KB, comma separated")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fuzz", type=int, default=5000, help="Random parity checks to run")
+    args = parser.parse_args()
+
+    ok = fuzz(args.fuzz)
+    print(f"Fuzz parity ({args.fuzz} cases): {'OK' if ok else 'FAILED'}")
+
+    print(f"{'case':<18} {'legacy MB/s':>12} {'new MB/s':>10} {'speedup':>8}  same")
+    for label, text in build_corpus([int(s) for s in args.sizes.split(",") if s]):
+        same = legacy_clean_text_preserve_meaning(text) == clean_text_preserve_meaning(text)
+        ok = ok and same
+        legacy = throughput(legacy_clean_text_preserve_meaning, text, args.repeat)
+        new = throughput(clean_text_preserve_meaning, text, args.repeat)
+        print(f"{label:<18} {legacy:>12.1f} {new:>10.1f} {new / legacy:>7.2f}x  {'yes' if same else 'NO'}")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
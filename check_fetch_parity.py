@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+from playwright.async_api import async_playwright
+
+from main import (
+    BROWSER_LAUNCH_ARGS,
+    DECISION_SNIPPET_JS,
+    SNIPPET_CONTEXT_CHARS,
+    SNIPPET_FALLBACK_PARAGRAPHS,
+    clean_text_preserve_meaning,
+    parse_decision_html,
+)
+
+# Compares the static-HTML decision parser and the in-page snippet extraction
+# against Chromium's innerText on the saved CanLII pages in fixtures/canlii.
+# Run: python check_fetch_parity.py
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "canlii")
+
+
+async def browser_text(page, html: str):
+    await page.set_content(html, wait_until="domcontentloaded")
+    node = await page.query_selector("#originalDocument")
+    if not node:
+        return None, None
+    extracted = await node.evaluate(DECISION_SNIPPET_JS, {
+        "maxLength": 10000,
+        "contextChars": SNIPPET_CONTEXT_CHARS,
+        "paragraphCount": SNIPPET_FALLBACK_PARAGRAPHS,
+    })
+    return await node.inner_text(), extracted["snippet"] if extracted else ""
+
+
+async def main():
+    failures = 0
+    fixtures = sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith(".html"))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
+        page = await browser.new_page()
+        # Fixtures are self-contained; never let them reach the network
+        await page.route("**/*", lambda route: route.abort())
+
+        for fixture in fixtures:
+            with open(os.path.join(FIXTURES_DIR, fixture), encoding="utf-8") as f:
+                html = f.read()
+
+            static_raw = parse_decision_html(html)
+            browser_raw, in_page_snippet = await browser_text(page, html)
+
+            if static_raw is None or browser_raw is None:
+                ok = static_raw is None and browser_raw is None
+            else:
+                expected = clean_text_preserve_meaning(browser_raw)
+                ok = clean_text_preserve_meaning(static_raw) == expected and in_page_snippet == expected
+
+            print(f"[{'OK' if ok else 'MISMATCH'}] {fixture}")
+            if not ok:
+                failures += 1
+                print(f"  http:    {clean_text_preserve_meaning(static_raw)[:300]!r}")
+                print(f"  browser: {clean_text_preserve_meaning(browser_raw)[:300]!r}")
+                print(f"  in-page: {(in_page_snippet or '')[:300]!r}")
+
+        await browser.close()
+
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(main()) else 0)
@@ -1,11 +1,734 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
 import asyncio
+import base64
+import http.cookiejar
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+import time
 import httpx
-from playwright.async_api import async_playwright
+import lxml.html
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from functools import partial
+from urllib.parse import quote, urljoin, urlparse
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
-app = FastAPI()
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# ----------------------------------------
+# Browser pool (shared by all scrapers)
+# ----------------------------------------
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+# Short-lived pages (case and decision pages) open at once per browser; the
+# long-lived search page of each borrowed context is not counted
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "16"))
+# A browser is retired once it has done this many main-frame navigations, or
+# once its process tree (browser, renderers, GPU) passes the RSS watermark.
+# 0 turns either check off.
+BROWSER_RECYCLE_NAVIGATIONS = int(os.getenv("BROWSER_RECYCLE_NAVIGATIONS", "2000"))
+BROWSER_RSS_WATERMARK_MB = int(os.getenv("BROWSER_RSS_WATERMARK_MB", "1500"))
+BROWSER_CHECK_INTERVAL = float(os.getenv("BROWSER_CHECK_INTERVAL", "30"))
+# Pages open longer than this are zombies: reported and closed
+PAGE_ZOMBIE_SECONDS = float(os.getenv("PAGE_ZOMBIE_SECONDS", "900"))
+
+
+# pid -> (ppid, rss_kb, cmdline) from /proc; empty where there is no /proc
+def read_processes():
+    procs = {}
+    if not os.path.isdir("/proc"):
+        return procs
+    page_kb = os.sysconf("SC_PAGE_SIZE") // 1024
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/statm") as f:
+                rss_kb = int(f.read().split()[1]) * page_kb
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+        except (OSError, IndexError, ValueError):
+            continue
+        procs[int(entry)] = (ppid, rss_kb, cmdline)
+    return procs
+
+
+# RSS in MB of every process tree whose root carries one of the tags, by tag
+def _tagged_rss_mb(tags):
+    procs = read_processes()
+    children = {}
+    for pid, (ppid, _, _) in procs.items():
+        children.setdefault(ppid, []).append(pid)
+    totals = {}
+    for pid, (_, _, cmdline) in procs.items():
+        tag = next((t for t in tags if f"--pool-browser-id={t}" in cmdline and "--type=" not in cmdline), None)
+        if tag is None:
+            continue
+        rss_kb, frontier = 0, [pid]
+        while frontier:
+            current = frontier.pop()
+            rss_kb += procs[current][1]
+            frontier.extend(children.get(current, ()))
+        totals[tag] = totals.get(tag, 0) + rss_kb / 1024
+    return totals
+
+
+# Keeps a few Chromium instances alive for the whole app lifetime. Each request
+# borrows an isolated BrowserContext via acquire(); the context is closed when
+# the request is done while the browser stays warm. Crashed or disconnected
+# browsers are relaunched on the next acquire.
+#
+# Pages are opened with new_page() and closed with close_page(), which the
+# scrapers call from a finally block. Every page of a borrowed context is
+# tracked: short-lived pages still open when their context is returned are
+# reported as leaked, and pages open past PAGE_ZOMBIE_SECONDS are closed by
+# the monitor. Browsers past the navigation or RSS limit stop taking new
+# contexts, a fresh browser takes their place, and they are closed once
+# their last context is returned.
+class BrowserPool:
+    def __init__(self, size: int = BROWSER_POOL_SIZE):
+        self.size = max(1, size)
+        self._playwright = None
+        self._browsers = []
+        self._retiring = []
+        self._in_use = {}
+        self._info = {}
+        self._contexts = {}
+        self._pages = {}
+        self._lock = asyncio.Lock()
+        self._monitor = None
+        self.stats = {"launched": 0, "recycled": 0, "leakedPages": 0, "zombiePages": 0}
+
+    async def start(self):
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            while len(self._browsers) < self.size:
+                self._browsers.append(await self._launch())
+        if self._monitor is None and BROWSER_CHECK_INTERVAL > 0:
+            self._monitor = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
+        async with self._lock:
+            for browser in self._browsers + self._retiring:
+                try:
+                    await browser.close()
+                except Exception as e:
+                    print(f"[Browser Pool] Close failed: {e}")
+            self._browsers = []
+            self._retiring = []
+            self._in_use = {}
+            self._info = {}
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def _launch(self):
+        tag = uuid.uuid4().hex[:12]
+        # Chromium ignores the unknown switch; it only marks the process so
+        # its memory can be found in /proc
+        browser = await self._playwright.chromium.launch(
+            headless=True, args=BROWSER_LAUNCH_ARGS + [f"--pool-browser-id={tag}"])
+        self._in_use[browser] = 0
+        self._info[browser] = {
+            "tag": tag,
+            "navigations": 0,
+            "rssMb": None,
+            "retireReason": None,
+            "slots": asyncio.Semaphore(max(1, BROWSER_MAX_PAGES)),
+        }
+        self.stats["launched"] += 1
+        print(f"[Browser Pool] Launched Chromium {browser.version}")
+        return browser
+
+    async def _replace(self, browser):
+        print("[Browser Pool] Browser disconnected, relaunching.")
+        self._in_use.pop(browser, None)
+        self._info.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception:
+            pass
+        fresh = await self._launch()
+        self._browsers[self._browsers.index(browser)] = fresh
+        return fresh
+
+    # Marks a browser for recycling; it takes no new contexts from here on
+    def _retire(self, browser, reason: str):
+        info = self._info.get(browser)
+        if info is None or info["retireReason"]:
+            return
+        info["retireReason"] = reason
+        self.stats["recycled"] += 1
+        BROWSER_RECYCLES.labels(reason).inc()
+        print(f"[Browser Pool] Recycling browser ({reason}, {info['navigations']} navigations, "
+              f"RSS {info['rssMb'] or 0:.0f} MB)")
+
+    # Moves retired browsers out of rotation and closes those with no
+    # borrowed contexts left; call with the lock held
+    async def _close_retired(self):
+        for browser in list(self._browsers):
+            if self._info.get(browser, {}).get("retireReason"):
+                self._browsers.remove(browser)
+                self._retiring.append(browser)
+        for browser in list(self._retiring):
+            if self._in_use.get(browser, 0) == 0:
+                self._retiring.remove(browser)
+                self._in_use.pop(browser, None)
+                self._info.pop(browser, None)
+                try:
+                    await browser.close()
+                except Exception as e:
+                    print(f"[Browser Pool] Close failed: {e}")
+
+    async def _checkout(self):
+        if self._playwright is None or len(self._browsers) < self.size:
+            await self.start()
+        async with self._lock:
+            for browser in list(self._browsers):
+                if not browser.is_connected():
+                    await self._replace(browser)
+            await self._close_retired()
+            while len(self._browsers) < self.size:
+                self._browsers.append(await self._launch())
+            browser = min(self._browsers, key=lambda b: self._in_use.get(b, 0))
+            self._in_use[browser] += 1
+            return browser
+
+    def _checkin(self, browser):
+        if browser in self._in_use:
+            self._in_use[browser] -= 1
+
+    def _track_page(self, browser, page):
+        if page in self._pages:
+            return
+        self._pages[page] = {"browser": browser, "openedAt": time.monotonic(), "slot": None}
+
+        def on_navigated(frame):
+            info = self._info.get(browser)
+            if info is None or frame != page.main_frame:
+                return
+            info["navigations"] += 1
+            if BROWSER_RECYCLE_NAVIGATIONS and info["navigations"] >= BROWSER_RECYCLE_NAVIGATIONS:
+                self._retire(browser, "navigations")
+
+        page.on("framenavigated", on_navigated)
+        page.on("close", lambda _: self._untrack_page(page))
+
+    def _untrack_page(self, page):
+        tracked = self._pages.pop(page, None)
+        if tracked and tracked["slot"] is not None:
+            tracked["slot"].release()
+
+    @asynccontextmanager
+    async def acquire(self, **context_options):
+        browser = await self._checkout()
+        try:
+            context = await browser.new_context(**context_options)
+        except Exception:
+            self._checkin(browser)
+            raise
+        self._contexts[context] = browser
+        context.on("page", partial(self._track_page, browser))
+        try:
+            yield context
+        finally:
+            self._contexts.pop(context, None)
+            leaked = [p for p, tracked in self._pages.items()
+                      if tracked["slot"] is not None and p.context == context]
+            if leaked:
+                self.stats["leakedPages"] += len(leaked)
+                PAGES_LEAKED.inc(len(leaked))
+                print(f"[Browser Pool] {len(leaked)} page(s) left open by their owner: "
+                      f"{', '.join(p.url for p in leaked[:5])}")
+            try:
+                await context.close()
+            except Exception as e:
+                print(f"[Browser Pool] Context close failed: {e}")
+            for page in context.pages + leaked:
+                self._untrack_page(page)
+            self._checkin(browser)
+            if self._info.get(browser, {}).get("retireReason") and self._in_use.get(browser, 0) == 0:
+                async with self._lock:
+                    await self._close_retired()
+
+    # capped pages count against BROWSER_MAX_PAGES and wait for a free slot;
+    # pass capped=False for the one long-lived page of a context. Always pair
+    # with close_page() in a finally block.
+    async def new_page(self, context, capped: bool = True):
+        browser = self._contexts.get(context)
+        slot = self._info[browser]["slots"] if capped and browser in self._info else None
+        if slot is not None:
+            await slot.acquire()
+        try:
+            page = await context.new_page()
+        except Exception:
+            if slot is not None:
+                slot.release()
+            raise
+        self._track_page(browser, page)
+        self._pages[page]["slot"] = slot
+        return page
+
+    async def close_page(self, page):
+        try:
+            await page.close()
+        except Exception as e:
+            print(f"[Browser Pool] Page close failed: {e}")
+        self._untrack_page(page)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(BROWSER_CHECK_INTERVAL)
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"[Browser Pool] Check failed: {e}")
+
+    # Measures browser memory, recycles browsers past the watermark and closes
+    # zombie pages; runs every BROWSER_CHECK_INTERVAL seconds
+    async def check(self):
+        tags = {info["tag"]: browser for browser, info in self._info.items()}
+        if BROWSER_RSS_WATERMARK_MB and tags:
+            rss = await asyncio.to_thread(_tagged_rss_mb, list(tags))
+            for tag, browser in tags.items():
+                if tag in rss:
+                    self._info[browser]["rssMb"] = rss[tag]
+                    if rss[tag] > BROWSER_RSS_WATERMARK_MB:
+                        self._retire(browser, "rss")
+
+        now = time.monotonic()
+        # Short-lived pages never legitimately stay open this long, and no page
+        # should outlive the borrowing of its context
+        zombies = [p for p, tracked in self._pages.items()
+                   if (tracked["slot"] is not None and now - tracked["openedAt"] > PAGE_ZOMBIE_SECONDS)
+                   or p.context not in self._contexts]
+        for page in zombies:
+            self.stats["zombiePages"] += 1
+            PAGES_ZOMBIE.inc()
+            print(f"[Browser Pool] Closing page open for {now - self._pages[page]['openedAt']:.0f}s: {page.url}")
+            await self.close_page(page)
+
+        async with self._lock:
+            await self._close_retired()
+
+    def gauges(self):
+        return {
+            "browsers": sum(1 for b in self._browsers if b.is_connected()),
+            "retiring": len(self._retiring),
+            "contexts": len(self._contexts),
+            "pages": sum(len(c.pages) for c in self._contexts),
+            "rssMb": {info["tag"]: info["rssMb"] for info in self._info.values() if info["rssMb"] is not None},
+        }
+
+    async def health(self):
+        async with self._lock:
+            browsers = [
+                {"version": b.version if b.is_connected() else None,
+                 "connected": b.is_connected(),
+                 "activeContexts": self._in_use.get(b, 0),
+                 "openPages": sum(1 for tracked in self._pages.values() if tracked["browser"] is b),
+                 "navigations": self._info[b]["navigations"] if b in self._info else None,
+                 "rssMb": self._info[b]["rssMb"] if b in self._info else None,
+                 "retiring": b in self._retiring}
+                for b in self._browsers + self._retiring
+            ]
+        return {
+            "started": self._playwright is not None,
+            "size": self.size,
+            "healthy": bool(browsers) and all(b["connected"] for b in browsers),
+            "browsers": browsers,
+            "limits": {
+                "maxPages": BROWSER_MAX_PAGES,
+                "recycleNavigations": BROWSER_RECYCLE_NAVIGATIONS,
+                "rssWatermarkMb": BROWSER_RSS_WATERMARK_MB,
+                "zombieSeconds": PAGE_ZOMBIE_SECONDS,
+            },
+            **self.stats,
+        }
+
+
+browser_pool = BrowserPool()
+
+# ----------------------------------------
+# Metrics and tracing
+# ----------------------------------------
+# In-process counters, histograms and gauges rendered in the Prometheus text
+# format at /metrics. Every scraper step runs inside stage(provider, name),
+# which records its duration and counts timeouts. With OTEL_TRACING=1 and
+# opentelemetry-api installed, each stage is also an OpenTelemetry span.
+# Spans are exported when opentelemetry-sdk is installed too: unless a
+# tracer provider is already set up (running under opentelemetry-instrument),
+# configure_tracing() installs one with the exporter named by
+# OTEL_TRACES_EXPORTER ("otlp", the default, needs an OTLP exporter package
+# and reads the OTEL_EXPORTER_OTLP_* variables; "console" prints spans).
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+TRACING_ENABLED = otel_trace is not None and os.getenv("OTEL_TRACING", "0") == "1"
+tracer_provider = None
+
+
+def configure_tracing():
+    global tracer_provider
+    if not isinstance(otel_trace.get_tracer_provider(), otel_trace.ProxyTracerProvider):
+        return
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        print("[Tracing] opentelemetry-sdk is not installed, spans are not exported.")
+        return
+    if os.getenv("OTEL_TRACES_EXPORTER", "otlp").lower() == "console":
+        exporter = ConsoleSpanExporter()
+    else:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            try:
+                from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            except ImportError:
+                print("[Tracing] No OTLP exporter installed, spans are not exported.")
+                return
+        exporter = OTLPSpanExporter()
+    resource = Resource.create({} if os.getenv("OTEL_SERVICE_NAME") else {"service.name": "crawl4ai-api"})
+    tracer_provider = TracerProvider(resource=resource)
+    tracer_provider.add_span_processor(BatchSpanProcessor(exporter))
+    otel_trace.set_tracer_provider(tracer_provider)
+    print(f"[Tracing] Exporting spans with {type(exporter).__name__}.")
+
+
+if TRACING_ENABLED:
+    configure_tracing()
+tracer = otel_trace.get_tracer("crawl4ai.scrapers") if TRACING_ENABLED else None
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+# Read when /metrics is scraped from a callback returning {label values:
+# value}; family is GaugeMetricFamily for current state and
+# CounterMetricFamily for running totals kept elsewhere (uploader stats...).
+class CallbackCollector(Collector):
+    def __init__(self, family, name: str, documentation: str, read, labels=()):
+        self.family = family
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+        self.labels = list(labels)
+
+    # Lets the registry learn the names without calling read before the
+    # objects it reads exist
+    def describe(self):
+        return [self.family(self.name, self.documentation, labels=self.labels)]
+
+    def collect(self):
+        metric = self.family(self.name, self.documentation, labels=self.labels)
+        for label_values, value in self.read().items():
+            metric.add_metric(list(label_values), value)
+        yield metric
+
+
+def register_callback(family, name: str, documentation: str, read, labels=()):
+    REGISTRY.register(CallbackCollector(family, name, documentation, read, labels))
+
+
+SCRAPER_STAGE_SECONDS = Histogram(
+    "scraper_stage_seconds", "Time spent in each scraper stage.", ("provider", "stage"), buckets=STAGE_BUCKETS)
+SCRAPER_TIMEOUTS = Counter(
+    "scraper_timeouts_total", "Stages that ended in a timeout.", ("provider", "stage"))
+SCRAPER_FALLBACKS = Counter(
+    "scraper_fallbacks_total", "Times a scraper fell back to a slower path.", ("provider", "fallback"))
+SCRAPER_CASES = Counter(
+    "scraper_cases_total", "Case records produced.", ("provider",))
+SCRAPER_CASE_FAILURES = Counter(
+    "scraper_case_failures_total", "Cases that failed to load or were returned without text.", ("provider",))
+WAIT_SECONDS = Histogram(
+    "scraper_wait_seconds", "In-page readiness waits by step and outcome.", ("step", "outcome"), buckets=STAGE_BUCKETS)
+BROWSER_RECYCLES = Counter(
+    "browser_recycles_total", "Browsers retired by the pool, by reason.", ("reason",))
+PAGES_LEAKED = Counter(
+    "browser_pages_leaked_total", "Short-lived pages still open when their context was returned.")
+PAGES_ZOMBIE = Counter(
+    "browser_pages_zombie_total", "Pages closed by the pool monitor.")
+
+register_callback(GaugeMetricFamily, "browser_pool_browsers", "Connected pooled browsers.",
+                  lambda: {(): browser_pool.gauges()["browsers"]})
+register_callback(GaugeMetricFamily, "browser_pool_retiring", "Browsers waiting for their last context before being closed.",
+                  lambda: {(): browser_pool.gauges()["retiring"]})
+register_callback(GaugeMetricFamily, "browser_rss_mb", "Last measured RSS of each browser process tree.",
+                  lambda: {(tag,): mb for tag, mb in browser_pool.gauges()["rssMb"].items()}, ("browser",))
+register_callback(GaugeMetricFamily, "browser_pool_contexts", "Browser contexts currently borrowed.",
+                  lambda: {(): browser_pool.gauges()["contexts"]})
+register_callback(GaugeMetricFamily, "browser_open_pages", "Pages open across all borrowed contexts.",
+                  lambda: {(): browser_pool.gauges()["pages"]})
+register_callback(CounterMetricFamily, "cloudinary_uploads_total", "Cloudinary uploader totals by outcome.",
+                  lambda: {(k,): v for k, v in cloudinary_uploader.stats.items()}, ("outcome",))
+register_callback(GaugeMetricFamily, "job_queue_depth", "Jobs waiting in the background queues.",
+                  lambda: {("images",): image_jobs.stats()["queued"], ("crawl",): crawl_jobs.stats()["queued"]}, ("queue",))
+register_callback(CounterMetricFamily, "route_policy_requests_total", "Requests seen by the route policies.",
+                  lambda: {(name, outcome): policy.stats()[outcome]
+                           for name, policy in ROUTE_POLICIES.items() for outcome in ("allowed", "blocked")},
+                  ("policy", "outcome"))
+
+
+def is_timeout(error: BaseException):
+    return isinstance(error, (asyncio.TimeoutError, PlaywrightTimeoutError, httpx.TimeoutException))
+
+
+@contextmanager
+def stage(provider: str, name: str):
+    if tracer:
+        span = tracer.start_as_current_span(f"{provider}.{name}", attributes={"provider": provider, "stage": name})
+    else:
+        span = nullcontext()
+    started = time.perf_counter()
+    with span:
+        try:
+            yield
+        except Exception as e:
+            if is_timeout(e):
+                SCRAPER_TIMEOUTS.labels(provider, name).inc()
+            raise
+        finally:
+            SCRAPER_STAGE_SECONDS.labels(provider, name).observe(time.perf_counter() - started)
+
+
+def observe_stage(provider: str, name: str, started: float):
+    # For stages that can't be wrapped in a with block (e.g. async with)
+    SCRAPER_STAGE_SECONDS.labels(provider, name).observe(time.perf_counter() - started)
+
+# ----------------------------------------
+# Per-host scheduling (token bucket + AIMD)
+# ----------------------------------------
+# Every navigation and direct request to a site goes through one HostLimiter
+# per hostname, shared by all requests in the process. A token bucket caps
+# the request rate (HOST_RATE_PER_SEC, bursts of HOST_BURST) and an AIMD
+# limit caps requests in flight: +1 per limit's worth of healthy responses,
+# halved on 429/5xx, timeouts and transport errors, or when the latency
+# average climbs past HOST_LATENCY_BACKOFF times the best seen. A 429 with
+# Retry-After also pauses the host until then.
+HOST_RATE_PER_SEC = float(os.getenv("HOST_RATE_PER_SEC", "10"))
+HOST_BURST = float(os.getenv("HOST_BURST", "20"))
+HOST_INITIAL_CONCURRENCY = float(os.getenv("HOST_INITIAL_CONCURRENCY", "4"))
+HOST_MIN_CONCURRENCY = float(os.getenv("HOST_MIN_CONCURRENCY", "1"))
+HOST_MAX_CONCURRENCY = float(os.getenv("HOST_MAX_CONCURRENCY", "16"))
+HOST_LATENCY_BACKOFF = float(os.getenv("HOST_LATENCY_BACKOFF", "3"))
+HOST_MAX_PAUSE = float(os.getenv("HOST_MAX_PAUSE", "60"))
+
+HOST_BACKOFFS = Counter("host_backoffs_total", "Concurrency decreases per host and reason.", ("host", "reason"))
+HOST_REQUESTS = Counter("host_requests_total", "Scheduled requests per host and outcome.", ("host", "outcome"))
+
+
+class HostLimiter:
+    def __init__(self, host: str):
+        self.host = host
+        self.rate = max(0.01, HOST_RATE_PER_SEC)
+        self.burst = max(1.0, HOST_BURST)
+        self.tokens = self.burst
+        self.refilled_at = time.monotonic()
+        self.limit = min(max(HOST_INITIAL_CONCURRENCY, HOST_MIN_CONCURRENCY), HOST_MAX_CONCURRENCY)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.latency = None
+        self.best_latency = None
+        self.decreased_at = 0.0
+        self._cond = asyncio.Condition()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    async def acquire(self):
+        async with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.in_flight >= int(self.limit):
+                    delay = None
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                else:
+                    delay = (1 - self.tokens) / self.rate
+                try:
+                    await asyncio.wait_for(self._cond.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _decrease(self, reason: str, now: float):
+        # One decrease per latency window, so a burst of failures from the
+        # same overload doesn't collapse the limit to the floor
+        if now - self.decreased_at < (self.latency or 1.0):
+            return
+        self.decreased_at = now
+        self.limit = max(HOST_MIN_CONCURRENCY, self.limit / 2)
+        HOST_BACKOFFS.labels(self.host, reason).inc()
+        print(f"[Host Limiter] {self.host}: {reason}, concurrency limit now {int(self.limit)}")
+
+    async def release(self, outcome: str, elapsed: float = None, retry_after: float = None):
+        async with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            HOST_REQUESTS.labels(self.host, outcome).inc()
+            if outcome in ("throttled", "server_error", "timeout", "error"):
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + min(retry_after, HOST_MAX_PAUSE))
+                self._decrease(outcome, now)
+            elif outcome == "ok":
+                if elapsed is not None:
+                    self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+                    # The best average slowly forgets, so a permanently
+                    # slower site becomes the new normal
+                    if self.best_latency is None or self.latency < self.best_latency:
+                        self.best_latency = self.latency
+                    else:
+                        self.best_latency *= 1.001
+                if self.best_latency and self.latency > HOST_LATENCY_BACKOFF * self.best_latency:
+                    self._decrease("latency", now)
+                else:
+                    self.limit = min(HOST_MAX_CONCURRENCY, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def stats(self):
+        return {
+            "limit": int(self.limit),
+            "inFlight": self.in_flight,
+            "tokens": round(self.tokens, 2),
+            "pausedFor": round(max(0.0, self.paused_until - time.monotonic()), 1),
+            "latencyMs": round(self.latency * 1000) if self.latency is not None else None,
+            "bestLatencyMs": round(self.best_latency * 1000) if self.best_latency is not None else None,
+        }
+
+
+# What the caller saw; read when the slot is released
+class HostSlot:
+    def __init__(self):
+        self.status = None
+        self.retry_after = None
+
+    def record(self, status, headers=None):
+        self.status = status
+        value = (headers or {}).get("retry-after")
+        if value and value.strip().isdigit():
+            self.retry_after = float(value)
+
+
+class HostScheduler:
+    def __init__(self):
+        self._limiters = {}
+
+    def limiter(self, url: str):
+        host = urlparse(url).hostname or ""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = HostLimiter(host)
+        return limiter
+
+    # Hold a slot only around the action that sends the request (goto, click,
+    # Enter), never the readiness wait after it, or a slow page keeps the
+    # slot for its whole timeout. measure_latency=False for clicks and key
+    # presses, whose duration isn't a response time; their errors still
+    # count. timeout_is_failure=False where a timeout says nothing about the
+    # host, e.g. a click waiting for an element that isn't there.
+    @asynccontextmanager
+    async def slot(self, url: str, measure_latency: bool = True, timeout_is_failure: bool = True):
+        limiter = self.limiter(url)
+        await limiter.acquire()
+        slot = HostSlot()
+        started = time.monotonic()
+        outcome = "ok"
+        try:
+            yield slot
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            if is_timeout(e):
+                outcome = "timeout" if timeout_is_failure else "slow"
+            else:
+                outcome = "error"
+            raise
+        finally:
+            if outcome == "ok" and slot.status is not None:
+                if slot.status == 429:
+                    outcome = "throttled"
+                elif slot.status >= 500:
+                    outcome = "server_error"
+            elapsed = time.monotonic() - started if measure_latency and slot.status is not None else None
+            await limiter.release(outcome, elapsed, slot.retry_after)
+
+    def stats(self):
+        return {host: limiter.stats() for host, limiter in self._limiters.items()}
+
+
+host_scheduler = HostScheduler()
+
+register_callback(GaugeMetricFamily, "host_concurrency_limit", "Current AIMD concurrency limit per host.",
+                  lambda: {(h,): l.limit for h, l in host_scheduler._limiters.items()}, ("host",))
+register_callback(GaugeMetricFamily, "host_in_flight", "Requests in flight per host.",
+                  lambda: {(h,): l.in_flight for h, l in host_scheduler._limiters.items()}, ("host",))
+
+
+async def scheduled_goto(page, url: str, **kwargs):
+    async with host_scheduler.slot(url) as slot:
+        response = await page.goto(url, **kwargs)
+        if response is not None:
+            slot.record(response.status, response.headers)
+        return response
+
+
+async def scheduled_get(client, url: str, **kwargs):
+    # client is a Playwright APIRequestContext (page.request) or an httpx client
+    async with host_scheduler.slot(url) as slot:
+        response = await client.get(url, **kwargs)
+        status = getattr(response, "status_code", None) or getattr(response, "status", None)
+        slot.record(status, {k.lower(): v for k, v in response.headers.items()})
+        return response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await browser_pool.start()
+    image_jobs.start()
+    crawl_jobs.start()
+    try:
+        yield
+    finally:
+        await crawl_jobs.stop()
+        await image_jobs.stop()
+        await browser_pool.stop()
+        await close_http_client()
+        await cloudinary_uploader.close()
+        document_store.close()
+        watchlist.close()
+        if tracer_provider is not None:
+            # Flushes the spans still waiting in the batch processor
+            tracer_provider.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS for frontend access
 app.add_middleware(
@@ -16,432 +739,1576 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Cloudinary config
-CLOUDINARY_UPLOAD_URL = "https://api.cloudinary.com/v1_1/dwvhna4j2/image/upload"
-UPLOAD_PRESET = "unsigned_auto"
+# ----------------------------------------
+# Local SQLite stores
+# ----------------------------------------
+# Small on-disk key/value tables. Calls run in a worker thread so the event
+# loop never blocks on disk; one connection per store guarded by a lock.
+class SqliteStore:
+    schema = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.schema)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _fetchone(self, sql: str, params=()):
+        with self._lock:
+            return self._connect().execute(sql, params).fetchone()
+
+    def _fetchall(self, sql: str, params=()):
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(sql, params)
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# ----------------------------------------
+# Cloudinary uploads
+# ----------------------------------------
+CLOUDINARY_UPLOAD_URL = os.getenv("CLOUDINARY_UPLOAD_URL", "https://api.cloudinary.com/v1_1/dwvhna4j2/image/upload")
+UPLOAD_PRESET = os.getenv("CLOUDINARY_UPLOAD_PRESET", "unsigned_auto")
+UPLOAD_CONCURRENCY = int(os.getenv("CLOUDINARY_UPLOAD_CONCURRENCY", "4"))
+UPLOAD_RETRIES = int(os.getenv("CLOUDINARY_UPLOAD_RETRIES", "3"))
+UPLOAD_TIMEOUT = float(os.getenv("CLOUDINARY_UPLOAD_TIMEOUT", "20"))
+UPLOAD_INDEX_PATH = os.getenv("UPLOAD_INDEX_PATH", "uploads.sqlite3")
+
+
+# sha256(image bytes) -> secure_url, so identical court-order pages are only
+# uploaded once across requests and restarts.
+class UploadIndex(SqliteStore):
+    schema = """
+        CREATE TABLE IF NOT EXISTS uploads (
+            content_hash TEXT PRIMARY KEY,
+            secure_url TEXT NOT NULL,
+            uploaded_at REAL NOT NULL
+        )
+    """
+
+    def _get(self, content_hash: str):
+        row = self._fetchone("SELECT secure_url FROM uploads WHERE content_hash = ?", (content_hash,))
+        return row[0] if row else None
+
+    def _put(self, content_hash: str, secure_url: str):
+        self._execute(
+            "INSERT OR REPLACE INTO uploads (content_hash, secure_url, uploaded_at) VALUES (?, ?, ?)",
+            (content_hash, secure_url, time.time()),
+        )
+
+    async def get(self, content_hash: str):
+        try:
+            return await asyncio.to_thread(self._get, content_hash)
+        except Exception as e:
+            print(f"[Upload Index] Read failed: {e}")
+            return None
+
+    async def put(self, content_hash: str, secure_url: str):
+        try:
+            await asyncio.to_thread(self._put, content_hash, secure_url)
+        except Exception as e:
+            print(f"[Upload Index] Write failed: {e}")
+
+
+class CloudinaryUploader:
+    def __init__(self, upload_url: str = CLOUDINARY_UPLOAD_URL, preset: str = UPLOAD_PRESET,
+                 concurrency: int = UPLOAD_CONCURRENCY, retries: int = UPLOAD_RETRIES,
+                 index: UploadIndex = None, timeout: float = UPLOAD_TIMEOUT, retry_delay: float = 0.5):
+        self.upload_url = upload_url
+        self.preset = preset
+        self.retries = max(0, retries)
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.index = index or UploadIndex(UPLOAD_INDEX_PATH)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._client = None
+        self._inflight = {}
+        self.stats = {"uploaded": 0, "deduplicated": 0, "retries": 0, "failed": 0}
+
+    def _get_client(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(10.0, self.timeout)),
+                limits=httpx.Limits(max_connections=max(4, UPLOAD_CONCURRENCY), max_keepalive_connections=max(4, UPLOAD_CONCURRENCY)),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.index.close()
+
+    async def _post(self, img_bytes: bytes):
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._semaphore:
+                    response = await self._get_client().post(
+                        self.upload_url,
+                        files={"file": img_bytes},
+                        data={"upload_preset": self.preset},
+                    )
+                if response.status_code < 500:
+                    if response.status_code >= 400:
+                        print(f"[Cloudinary Upload Failed] {response.status_code}: {response.text[:200]}")
+                        return None
+                    return response.json().get("secure_url")
+                print(f"[Cloudinary] {response.status_code} on attempt {attempt + 1}")
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                print(f"[Cloudinary] {type(e).__name__} on attempt {attempt + 1}: {e}")
+            if attempt < self.retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+        return None
+
+    async def _upload(self, content_hash: str, img_bytes: bytes):
+        secure_url = await self.index.get(content_hash)
+        if secure_url:
+            self.stats["deduplicated"] += 1
+            return secure_url
+        secure_url = await self._post(img_bytes)
+        if secure_url:
+            self.stats["uploaded"] += 1
+            await self.index.put(content_hash, secure_url)
+        else:
+            self.stats["failed"] += 1
+        return secure_url
+
+    async def upload(self, img_bytes: bytes):
+        if not img_bytes:
+            return None
+        content_hash = hashlib.sha256(img_bytes).hexdigest()
+        task = self._inflight.get(content_hash)
+        if task is None:
+            task = asyncio.ensure_future(self._upload(content_hash, img_bytes))
+            self._inflight[content_hash] = task
+            task.add_done_callback(lambda _: self._inflight.pop(content_hash, None))
+        else:
+            self.stats["deduplicated"] += 1
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            print(f"[Cloudinary Upload Failed] {e}")
+            return None
+
+
+cloudinary_uploader = CloudinaryUploader()
+
 
 async def upload_to_cloudinary(img_bytes: bytes):
-    try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            response = await client.post(
-                CLOUDINARY_UPLOAD_URL,
-                files={"file": img_bytes},
-                data={"upload_preset": UPLOAD_PRESET}
+    return await cloudinary_uploader.upload(img_bytes)
+
+# ----------------------------------------
+# Background job queues
+# ----------------------------------------
+# A bounded queue drained by a fixed worker pool, plus a table of jobs looked
+# up by id. Finished jobs are dropped once ttl seconds have passed since they
+# finished, or oldest first while the table holds more than max_entries;
+# queued and running jobs are never dropped, so their ids always resolve.
+FINISHED_JOB_STATUSES = ("done", "partial", "failed")
+
+
+class JobQueue:
+    ttl = 3600.0
+    max_entries = 1000
+    log_tag = "Job"
+
+    def __init__(self, workers: int, maxsize: int):
+        self.workers = max(1, workers)
+        self.maxsize = max(1, maxsize)
+        self._queue = None
+        self._tasks = []
+        self._jobs = OrderedDict()
+
+    def start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def _evict(self):
+        now = time.time()
+        excess = len(self._jobs) - self.max_entries
+        for job_id, job in list(self._jobs.items()):
+            if job["status"] not in FINISHED_JOB_STATUSES:
+                continue
+            if excess > 0 or now - job.get("finishedAt", job["createdAt"]) >= self.ttl:
+                del self._jobs[job_id]
+                excess -= 1
+
+    # A new job record; the caller adds it to self._jobs and queues
+    # (job_id, args) for _run
+    def _new_job(self, **fields):
+        self.start()
+        self._evict()
+        return {"id": uuid.uuid4().hex, "status": "queued", **fields, "createdAt": time.time()}
+
+    def get(self, job_id: str):
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    # Does the work of one job; may set a final status itself, otherwise a
+    # job that returns is "done"
+    async def _run(self, job, *args):
+        raise NotImplementedError
+
+    async def _worker(self):
+        while True:
+            job_id, args = await self._queue.get()
+            job = self._jobs.get(job_id)
+            try:
+                if job is not None:
+                    job["status"] = "running"
+                    job["startedAt"] = time.time()
+                    await self._run(job, *args)
+                    if job["status"] == "running":
+                        job["status"] = "done"
+            except Exception as e:
+                print(f"[{self.log_tag} Error] {job_id}: {e}")
+                job["status"] = "failed"
+                job["error"] = str(e)
+            finally:
+                if job is not None:
+                    job["finishedAt"] = time.time()
+                self._queue.task_done()
+
+    def stats(self):
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "maxQueue": self.maxsize,
+            "running": sum(1 for job in self._jobs.values() if job["status"] == "running"),
+            "jobs": len(self._jobs),
+        }
+
+
+# ----------------------------------------
+# Deferred OpenRoom image jobs
+# ----------------------------------------
+# With defer_images, OpenRoom records are returned before their court-order
+# images are processed. Each case becomes one job on a bounded queue drained
+# by a fixed worker pool; a full queue makes the scraper wait (backpressure)
+# instead of buffering an unbounded burst. Results are looked up by job id.
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+IMAGE_QUEUE_MAXSIZE = int(os.getenv("IMAGE_QUEUE_MAXSIZE", "100"))
+IMAGE_JOB_TTL = float(os.getenv("IMAGE_JOB_TTL", "3600"))
+IMAGE_JOB_MAX_ENTRIES = int(os.getenv("IMAGE_JOB_MAX_ENTRIES", "5000"))
+
+
+class ImageJobQueue(JobQueue):
+    ttl = IMAGE_JOB_TTL
+    max_entries = IMAGE_JOB_MAX_ENTRIES
+    log_tag = "Image Job"
+
+    def __init__(self, workers: int = IMAGE_WORKERS, maxsize: int = IMAGE_QUEUE_MAXSIZE):
+        super().__init__(workers, maxsize)
+        self._client = None
+
+    async def stop(self):
+        await super().stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # cookies: absolute image URL -> {name: value} of the cookies to send
+    async def submit(self, link: str, img_urls, cookies=None):
+        job = self._new_job(link=link, total=len(img_urls), done=0, courtOrderImages=[])
+        self._jobs[job["id"]] = job
+        # Awaits while the queue is full
+        await self._queue.put((job["id"], (link, list(img_urls), cookies or {})))
+        return job["id"]
+
+    # Own client for the OpenRoom image hosts, kept apart from the CanLII
+    # client and its headers. Its jar refuses every cookie: each image goes
+    # out with the browser cookies scoped to its own URL as a Cookie header
+    # and nothing a response sets carries over to other jobs.
+    def _get_client(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(20.0, connect=10.0),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                cookies=http.cookiejar.CookieJar(policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+                follow_redirects=True,
             )
-            return response.json().get("secure_url")
-    except Exception as e:
-        print(f"[Cloudinary Upload Failed] {e}")
+        return self._client
+
+    async def _download(self, url: str, cookies: dict):
+        headers = {"Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items())} if cookies else None
+        try:
+            response = await scheduled_get(self._get_client(), url, headers=headers)
+            if response.status_code == 200:
+                return response.content
+            print(f"[Image Error] {url}: HTTP {response.status_code}")
+        except Exception as e:
+            print(f"[Image Error] {url}: {e}")
         return None
 
+    async def _run(self, job, link: str, img_urls, cookies: dict):
+        async def handle(url):
+            absolute = urljoin(link, url)
+            with stage("OPENROOM", "image_download"):
+                img_bytes = await self._download(absolute, cookies.get(absolute))
+            with stage("OPENROOM", "upload"):
+                uploaded = await upload_to_cloudinary(img_bytes) if img_bytes else None
+            job["done"] += 1
+            return uploaded
+
+        cloud_imgs = await asyncio.gather(*(handle(url) for url in img_urls))
+        job["courtOrderImages"] = [img for img in cloud_imgs if img]
+        job["status"] = "done" if len(job["courtOrderImages"]) == len(img_urls) else "partial"
+
+
+image_jobs = ImageJobQueue()
+
 # ----------------------------------------
-# 1 Ontario (OpenRoom)
+# Network resource blocking (context.route)
 # ----------------------------------------
-async def scrape_openroom(name: str):
-    results = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto("https://openroom.ca/documents", wait_until="networkidle")
-        await page.fill("#search-dropdown", name)
-        await page.keyboard.press("Enter")
-        await page.wait_for_timeout(5000)
+# We only read DOM text, so most subresources are wasted bandwidth.
+# BLOCK_RESOURCES=0 turns the policies off.
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "1") != "0"
+
+TRACKER_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "googleadservices.com", "facebook.net",
+    "facebook.com", "hotjar.com", "hotjar.io", "segment.io", "segment.com",
+    "mixpanel.com", "clarity.ms", "bing.com", "newrelic.com", "nr-data.net",
+    "sentry.io", "intercom.io", "fullstory.com", "linkedin.com", "tiktok.com",
+)
 
-        links = await page.evaluate("""
-            () => Array.from(document.querySelectorAll('a.w-full'))
-                .filter(a => a.href.includes('/documents/profile'))
-                .map(a => a.href.startsWith('http') ? a.href : 'https://openroom.ca' + a.getAttribute('href'))
-        """)
+# Rough average sizes used to estimate what blocking saved, per resource type
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 40_000,
+    "font": 35_000,
+    "stylesheet": 25_000,
+    "media": 250_000,
+    "script": 30_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 5_000,
+}
+
+
+def _env_list(key: str, default: str):
+    return {item.strip() for item in os.getenv(key, default).split(",") if item.strip()}
+
+
+class RoutePolicy:
+    def __init__(self, name: str, blocked_types, blocked_hosts=TRACKER_HOSTS):
+        self.name = name
+        self.blocked_types = set(blocked_types)
+        self.blocked_hosts = tuple(blocked_hosts)
+        self.allowed = 0
+        self.blocked = 0
+        self.blocked_by_type = {}
+        self.estimated_bytes_saved = 0
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.blocked_types:
+            return True
+        host = urlparse(url).hostname or ""
+        return any(host == h or host.endswith("." + h) for h in self.blocked_hosts)
+
+    async def handle(self, route):
+        request = route.request
+        try:
+            if self.should_block(request.url, request.resource_type):
+                self.blocked += 1
+                self.blocked_by_type[request.resource_type] = self.blocked_by_type.get(request.resource_type, 0) + 1
+                self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(request.resource_type, 5_000)
+                await route.abort("blockedbyclient")
+            else:
+                self.allowed += 1
+                await route.continue_()
+        except Exception as e:
+            # Page or context already closed while the request was in flight
+            print(f"[Route Policy] {self.name}: {e}")
+
+    def stats(self):
+        return {
+            "allowed": self.allowed,
+            "blocked": self.blocked,
+            "blockedByType": dict(self.blocked_by_type),
+            "estimatedBytesSaved": self.estimated_bytes_saved,
+        }
+
+
+ROUTE_POLICIES = {
+    # Court-order images are read from <img src>, so images stay allowed
+    "OPENROOM": RoutePolicy("OPENROOM", _env_list("OPENROOM_BLOCKED_TYPES", "font,media")),
+    "CANLII": RoutePolicy("CANLII", _env_list("CANLII_BLOCKED_TYPES", "image,font,media,stylesheet")),
+}
+
+
+async def apply_route_policy(context, policy_name: str):
+    if BLOCK_RESOURCES:
+        await context.route("**/*", ROUTE_POLICIES[policy_name].handle)
+
+# ----------------------------------------
+# Saved storage state and deep-link searches
+# ----------------------------------------
+# Cookies (e.g. CanLII's consent) and local storage are saved per site after
+# a successful search and loaded into every new context for that site, so
+# consent banners are answered once. Files older than
+# STORAGE_STATE_MAX_AGE_HOURS are refreshed from the next successful search.
+STORAGE_STATE_DIR = os.getenv("STORAGE_STATE_DIR", "storage_state")
+STORAGE_STATE_MAX_AGE = float(os.getenv("STORAGE_STATE_MAX_AGE_HOURS", "24")) * 3600
+
+
+class StorageStates:
+    def __init__(self, directory: str = STORAGE_STATE_DIR, max_age: float = STORAGE_STATE_MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+        self._loaded = {}
+        self._lock = asyncio.Lock()
 
-        for link in links:
+    def path(self, site: str):
+        return os.path.join(self.directory, f"{site.lower()}.json")
+
+    def _fresh(self, path: str):
+        try:
+            return time.time() - os.path.getmtime(path) < self.max_age
+        except OSError:
+            return False
+
+    # Options for browser_pool.acquire()
+    def context_options(self, site: str):
+        path = self.path(site)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return {}
+        cached = self._loaded.get(site)
+        if cached is None or cached[0] != mtime:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    cached = self._loaded[site] = (mtime, json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"[Storage State] Ignoring unreadable {path}: {e}")
+                return {}
+        return {"storage_state": cached[1]}
+
+    async def save(self, site: str, context):
+        path = self.path(site)
+        if self._fresh(path):
+            return
+        async with self._lock:
+            if self._fresh(path):
+                return
             try:
-                case_page = await browser.new_page()
-                await case_page.goto(link, wait_until="networkidle")
-                await asyncio.sleep(1)
+                os.makedirs(self.directory, exist_ok=True)
+                state = await context.storage_state()
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, path)
+                print(f"[Storage State] Saved {site} state ({len(state.get('cookies', []))} cookies)")
+            except Exception as e:
+                print(f"[Storage State] Save failed for {site}: {e}")
+
+
+storage_states = StorageStates()
+
+
+# Searches open the provider's results URL directly (filters already in the
+# URL) and fall back to the UI flow when no results page shows up (CanLII's
+# "no results" answer is accepted as is). If the UI flow then does find
+# results, the deep link is considered broken and skipped for
+# DEEP_LINK_RETRY_AFTER seconds, so a changed URL scheme costs one extra
+# navigation per search only until it is noticed.
+#
+# A results page is only used when it shows the query (in a search box or
+# the page text) and, on CanLII, every result is from the searched
+# jurisdiction; a site ignoring a URL parameter would otherwise list other
+# people's cases. Off by default until the URL templates have been checked
+# against the live sites; DEEP_LINKS=1 turns them on.
+DEEP_LINKS_ENABLED = os.getenv("DEEP_LINKS", "0") == "1"
+DEEP_LINK_RETRY_AFTER = float(os.getenv("DEEP_LINK_RETRY_AFTER", "3600"))
+DEEP_LINK_TIMEOUT_MS = int(os.getenv("DEEP_LINK_TIMEOUT_MS", "10000"))
+
 
-                await case_page.evaluate("""
+class DeepLinks:
+    def __init__(self):
+        self.broken_until = {}
+        self.counts = {}
+
+    def usable(self, provider: str, template: str):
+        return DEEP_LINKS_ENABLED and bool(template) and time.monotonic() >= self.broken_until.get(provider, 0)
+
+    def record(self, provider: str, outcome: str):
+        counts = self.counts.setdefault(provider, {})
+        counts[outcome] = counts.get(outcome, 0) + 1
+        if outcome in ("broken", "mismatch"):
+            self.broken_until[provider] = time.monotonic() + DEEP_LINK_RETRY_AFTER
+            reason = ("found nothing the UI search found" if outcome == "broken"
+                      else "showed results for a different search")
+            print(f"[Deep Link] {provider} deep link {reason}, using the UI for {int(DEEP_LINK_RETRY_AFTER)}s")
+
+    def stats(self):
+        return {
+            provider: {**counts, "disabledFor": round(max(0.0, self.broken_until.get(provider, 0) - time.monotonic()))}
+            for provider, counts in self.counts.items()
+        }
+
+
+deep_links = DeepLinks()
+
+
+def deep_link_url(template: str, name: str):
+    return template.format(query=quote(name))
+
+
+# True when the page shows the query in an input or anywhere in its text
+SEARCH_SHOWS_QUERY_JS = """
+    (query) => {
+        const norm = (s) => (s || '').toLowerCase().split(/\\s+/).filter(Boolean).join(' ');
+        const q = norm(query);
+        if (!q) return false;
+        if (Array.from(document.querySelectorAll('input')).some(i => norm(i.value) === q)) return true;
+        return norm(document.body?.innerText).includes(q);
+    }
+"""
+
+
+async def page_shows_query(page, name: str):
+    try:
+        return bool(await page.evaluate(SEARCH_SHOWS_QUERY_JS, name))
+    except Exception:
+        return False
+
+# ----------------------------------------
+# Readiness waits
+# ----------------------------------------
+# Instead of fixed sleeps, each step waits in-page for the first of: a
+# selector appearing, the result list changing from a previous signature, or
+# the DOM staying quiet (no mutations) for quiet_ms. The outcome and the time
+# actually waited are recorded per step in WAIT_STATS.
+#
+# When a selector or changed_from is given, "quiet" only counts once the page
+# has changed at all: while a search or court-order request is still in
+# flight the DOM is quiet too, and that must end in "timeout" (the caller
+# fails the step) rather than pass for an empty answer.
+WAIT_TIMEOUTS_MS = {
+    "openroom.search": 10000,
+    "openroom.case": 2000,
+    "openroom.court_order": 5000,
+    "openroom.scroll": 2000,
+    "canlii.facet": 8000,
+    "canlii.next_page": 10000,
+}
+
+READY_JS = """
+({selector, signatureSelector, changedFrom, quietMs, timeoutMs}) => new Promise(resolve => {
+    const start = performance.now();
+    let lastMutation = start;
+    let mutated = false;
+    const observer = new MutationObserver(() => { lastMutation = performance.now(); mutated = true; });
+    const awaitingChange = Boolean(selector) || (changedFrom !== null && changedFrom !== undefined);
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    const signature = () => Array.from(document.querySelectorAll(signatureSelector || 'li.result .name a'))
+        .map(a => a.getAttribute('href')).join('|');
+    const finish = (reason) => { observer.disconnect(); resolve(reason); };
+    const tick = () => {
+        const now = performance.now();
+        if (selector && document.querySelector(selector)) return finish('selector');
+        if (changedFrom !== null && changedFrom !== undefined && signature() && signature() !== changedFrom) return finish('changed');
+        if (quietMs && (mutated || !awaitingChange) && now - lastMutation >= quietMs) return finish('quiet');
+        if (now - start >= timeoutMs) return finish('timeout');
+        setTimeout(tick, 50);
+    };
+    tick();
+})
+"""
+
+RESULTS_SIGNATURE_JS = """
+() => Array.from(document.querySelectorAll('li.result .name a')).map(a => a.getAttribute('href')).join('|')
+"""
+
+WAIT_STATS = {}
+
+
+def record_wait(step: str, elapsed_ms: float, outcome: str):
+    stats = WAIT_STATS.setdefault(step, {"count": 0, "totalMs": 0.0, "maxMs": 0.0, "outcomes": {}})
+    stats["count"] += 1
+    stats["totalMs"] += elapsed_ms
+    stats["maxMs"] = max(stats["maxMs"], elapsed_ms)
+    stats["outcomes"][outcome] = stats["outcomes"].get(outcome, 0) + 1
+
+
+def wait_stats():
+    return {
+        step: {**stats, "avgMs": round(stats["totalMs"] / stats["count"], 1) if stats["count"] else 0.0}
+        for step, stats in WAIT_STATS.items()
+    }
+
+
+async def wait_until_ready(page, step: str, selector: str = None, changed_from: str = None,
+                           quiet_ms: int = 0, timeout_ms: int = None):
+    timeout_ms = timeout_ms or WAIT_TIMEOUTS_MS.get(step, 10000)
+    started = time.monotonic()
+    try:
+        outcome = await page.evaluate(READY_JS, {
+            "selector": selector,
+            "signatureSelector": None,
+            "changedFrom": changed_from,
+            "quietMs": quiet_ms,
+            "timeoutMs": timeout_ms,
+        })
+    except Exception as e:
+        # A full navigation destroys the execution context mid-wait
+        if "context was destroyed" not in str(e) and "navigation" not in str(e).lower():
+            print(f"[Wait] {step} failed: {e}")
+            outcome = "error"
+        else:
+            outcome = "navigated"
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+            except Exception:
+                outcome = "timeout"
+    elapsed = time.monotonic() - started
+    record_wait(step, elapsed * 1000, outcome)
+    WAIT_SECONDS.labels(step, outcome).observe(elapsed)
+    return outcome
+
+
+async def results_signature(page):
+    try:
+        return await page.evaluate(RESULTS_SIGNATURE_JS)
+    except Exception:
+        return ""
+
+# Scrapers are async generators of events: "page" at each results page,
+# "case" with a finished record and "progress" after each case.
+async def collect_cases(events):
+    return [event["data"] async for event in events if event["event"] == "case"]
+
+# ----------------------------------------
+# 1 Ontario (OpenRoom)
+# ----------------------------------------
+# Overridable so the scrapers can run against a local mock (mock_providers.py)
+OPENROOM_BASE_URL = os.getenv("OPENROOM_BASE_URL", "https://openroom.ca").rstrip("/")
+# Deep link to the results for {query}; see DeepLinks
+OPENROOM_SEARCH_URL = os.getenv("OPENROOM_SEARCH_URL", f"{OPENROOM_BASE_URL}/documents?search={{query}}")
+
+# Case-page fields as field -> label. A field's value is the first line of
+# text after its label in the first div whose innerText contains the label.
+OPENROOM_FIELDS = {
+    "tenant": "Tenant",
+    "landlord": "Landlord",
+    "fileNumber": "File Number",
+    "address": "Property Address",
+    "topic": "Topics",
+    "amountOwed": "Amount owed",
+}
+
+# Reads innerText once per top-level div (a div's text contains its
+# descendants' text, so those come first in document order) and resolves
+# every label from it. Labels only found in text hidden from the top-level
+# divs fall back to the per-div scan the original extractor used.
+OPENROOM_METADATA_JS = """
+    (fields) => {
+        const take = (text, label) => text.split(label)[1]?.trim().split('\\n')[0] || null;
+        const values = {};
+        const matched = {};
+        const pending = new Map(Object.entries(fields));
+
+        const containers = Array.from(document.querySelectorAll('div'))
+            .filter(el => !el.parentElement?.closest('div'));
+        for (let i = 0; i < containers.length && pending.size; i++) {
+            const text = containers[i].innerText;
+            for (const [field, label] of pending) {
+                if (text.includes(label)) {
+                    values[field] = take(text, label);
+                    matched[field] = {label, strategy: 'container', container: i};
+                    pending.delete(field);
+                }
+            }
+        }
+
+        if (pending.size) {
+            const divs = Array.from(document.querySelectorAll('div'));
+            for (const [field, label] of pending) {
+                const block = divs.find(el => el.innerText.includes(label));
+                values[field] = block ? take(block.innerText, label) : null;
+                matched[field] = block ? {label, strategy: 'scan'} : null;
+            }
+        }
+        return {values, matched};
+    }
+"""
+
+
+async def extract_openroom_metadata(page, fields=OPENROOM_FIELDS):
+    result = await page.evaluate(OPENROOM_METADATA_JS, fields)
+    return result["values"], result["matched"]
+
+# known (watchlist mode): profile links already seen for this name; those
+# profiles are not opened again.
+OPENROOM_LINKS_JS = """
+    (base) => Array.from(document.querySelectorAll('a.w-full'))
+        .filter(a => a.href.includes('/documents/profile'))
+        .map(a => a.href.startsWith('http') ? a.href : base + a.getAttribute('href'))
+"""
+
+
+async def search_openroom_deep_link(page, name: str):
+    try:
+        with stage("OPENROOM", "deep_link"):
+            await scheduled_goto(page, deep_link_url(OPENROOM_SEARCH_URL, name), wait_until="domcontentloaded")
+            outcome = await wait_until_ready(page, "openroom.search", selector="a.w-full[href*='/documents/profile']", quiet_ms=1500)
+            if outcome in ("timeout", "error"):
+                raise RuntimeError(f"results did not load ({outcome})")
+            return await page.evaluate(OPENROOM_LINKS_JS, OPENROOM_BASE_URL)
+    except Exception as e:
+        print(f"[OpenRoom] Deep link search failed: {e}")
+        return []
+
+
+async def search_openroom_ui(page, name: str):
+    with stage("OPENROOM", "goto"):
+        await scheduled_goto(page, f"{OPENROOM_BASE_URL}/documents", wait_until="networkidle")
+    with stage("OPENROOM", "search"):
+        await page.fill("#search-dropdown", name)
+        async with host_scheduler.slot(OPENROOM_BASE_URL, measure_latency=False):
+            await page.keyboard.press("Enter")
+        outcome = await wait_until_ready(page, "openroom.search", selector="a.w-full[href*='/documents/profile']", quiet_ms=1500)
+        # A search that never answered is an error, not "no cases"
+        if outcome in ("timeout", "error"):
+            raise RuntimeError(f"OpenRoom search results did not load ({outcome})")
+        return await page.evaluate(OPENROOM_LINKS_JS, OPENROOM_BASE_URL)
+
+
+async def iter_openroom(name: str, defer_images: bool = False, known: dict = None):
+    started = time.perf_counter()
+    async with browser_pool.acquire(**storage_states.context_options("OPENROOM")) as context:
+        observe_stage("OPENROOM", "browser", started)
+        await apply_route_policy(context, "OPENROOM")
+        page = await browser_pool.new_page(context, capped=False)
+        try:
+            async for event in iter_openroom_session(context, page, name, defer_images, known):
+                yield event
+        finally:
+            await browser_pool.close_page(page)
+
+
+# One search on an already open page; batch runs reuse the page and its
+# context across names.
+async def iter_openroom_session(context, page, name: str, defer_images: bool = False, known: dict = None):
+    links = []
+    deep_link = deep_links.usable("OPENROOM", OPENROOM_SEARCH_URL)
+    if deep_link:
+        links = await search_openroom_deep_link(page, name)
+        if links and not await page_shows_query(page, name):
+            deep_links.record("OPENROOM", "mismatch")
+            links = []
+        elif links:
+            deep_links.record("OPENROOM", "ok")
+    if not links:
+        if deep_link:
+            SCRAPER_FALLBACKS.labels("OPENROOM", "ui_search").inc()
+        links = await search_openroom_ui(page, name)
+        if deep_link:
+            deep_links.record("OPENROOM", "broken" if links else "empty")
+    if links:
+        await storage_states.save("OPENROOM", context)
+    page_event = {"event": "page", "provider": "OPENROOM", "page": 1, "count": len(links)}
+    if known is not None:
+        fresh = [link for link in links if link not in known]
+        page_event["skipped"] = len(links) - len(fresh)
+        links = fresh
+    yield page_event
+
+    for done, link in enumerate(links, start=1):
+        record = None
+        case_page = None
+        try:
+            with stage("OPENROOM", "case_load"):
+                case_page = await browser_pool.new_page(context)
+                await scheduled_goto(case_page, link, wait_until="networkidle")
+                await wait_until_ready(case_page, "openroom.case", quiet_ms=250)
+
+            with stage("OPENROOM", "court_order"):
+                clicked = await case_page.evaluate("""
                     () => {
                         const span = Array.from(document.querySelectorAll('span'))
                             .find(el => el.textContent.includes('View court order'));
-                        if (span && span.parentElement) span.parentElement.click();
+                        if (!span || !span.parentElement) return false;
+                        span.parentElement.click();
+                        return true;
                     }
                 """)
-                await asyncio.sleep(3)
+                # Cases without a court order have no button and nothing to wait for
+                if clicked:
+                    outcome = await wait_until_ready(case_page, "openroom.court_order",
+                                                     selector="div.mt-2.flex.flex-col.gap-y-2 img", quiet_ms=1000)
+                    if outcome in ("timeout", "error"):
+                        raise RuntimeError(f"court order did not load ({outcome})")
                 await case_page.evaluate("window.scrollBy(0, 2000)")
-                await asyncio.sleep(2)
+                await wait_until_ready(case_page, "openroom.scroll", quiet_ms=300)
 
-                metadata = await case_page.evaluate("""
-                    () => {
-                        const extract = (label) => {
-                            const block = Array.from(document.querySelectorAll('div'))
-                                .find(el => el.innerText.includes(label));
-                            if (!block) return null;
-                            const text = block.innerText;
-                            return text.split(label)[1]?.trim().split('\\n')[0] || null;
-                        };
-                        return {
-                            tenant: extract('Tenant'),
-                            landlord: extract('Landlord'),
-                            fileNumber: extract('File Number'),
-                            address: extract('Property Address'),
-                            topic: extract('Topics'),
-                            amountOwed: extract('Amount owed'),
-                        };
-                    }
-                """)
+            with stage("OPENROOM", "metadata"):
+                metadata, matched = await extract_openroom_metadata(case_page)
+            missing = [field for field, how in matched.items() if how is None]
+            if missing:
+                print(f"[OpenRoom] No match for {missing} on {link}")
+            if any(how and how["strategy"] == "scan" for how in matched.values()):
+                SCRAPER_FALLBACKS.labels("OPENROOM", "metadata_scan").inc()
 
-                img_elements = await case_page.query_selector_all("div.mt-2.flex.flex-col.gap-y-2 img")
+            img_elements = await case_page.query_selector_all("div.mt-2.flex.flex-col.gap-y-2 img")
 
-                # --- NEW LOGIC: Fetch all images in parallel ---
-                async def download_and_upload(page, img_url):
-                    try:
-                        response = await page.request.get(img_url)
-                        if response.ok:
-                            img_bytes = await response.body()
+            # --- NEW LOGIC: Fetch all images in parallel ---
+            async def download_and_upload(page, img_url):
+                try:
+                    with stage("OPENROOM", "image_download"):
+                        response = await scheduled_get(page.request, urljoin(page.url, img_url))
+                    if response.ok:
+                        img_bytes = await response.body()
+                        with stage("OPENROOM", "upload"):
                             uploaded = await upload_to_cloudinary(img_bytes)
-                            return uploaded
-                    except Exception as e:
-                        print(f"[Image Error] {img_url}: {e}")
-                    return None
-
-                # Collect all image URLs
-                img_urls = []
-                for img in img_elements:
-                    img_url = await img.get_attribute("src")
-                    if img_url:
-                        img_urls.append(img_url)
-
+                        return uploaded
+                except Exception as e:
+                    print(f"[Image Error] {img_url}: {e}")
+                return None
+
+            # Collect all image URLs
+            img_urls = []
+            for img in img_elements:
+                img_url = await img.get_attribute("src")
+                if img_url:
+                    img_urls.append(img_url)
+
+            image_job_id = None
+            if defer_images:
+                # Images are handled by the background workers; each image
+                # URL takes along the browser cookies that apply to it, in
+                # case it needs the session (none for other hosts)
+                cookies = {}
+                for img_url in img_urls:
+                    absolute = urljoin(link, img_url)
+                    cookies[absolute] = {c["name"]: c["value"] for c in await context.cookies([absolute])}
+                with stage("OPENROOM", "image_enqueue"):
+                    image_job_id = await image_jobs.submit(link, img_urls, cookies)
+                cloud_imgs = []
+            else:
                 # Download and upload images in parallel
                 tasks = [download_and_upload(case_page, url) for url in img_urls]
-                cloud_imgs = await asyncio.gather(*tasks)
+                with stage("OPENROOM", "images"):
+                    cloud_imgs = await asyncio.gather(*tasks)
 
                 # Filter out any failed uploads
                 cloud_imgs = [img for img in cloud_imgs if img]
 
-                # --- Result aggregation ---
-                results.append({
-                    "provider": "OPENROOM",
-                    "links": [link],
-                    "tenantName": metadata.get("tenant"),
-                    "landlord": metadata.get("landlord"),
-                    "caseId": metadata.get("fileNumber"),
-                    "address": metadata.get("address"),
-                    "topic": metadata.get("topic"),
-                    "amountOwed": metadata.get("amountOwed"),
-                    "courtOrderImages": cloud_imgs
-                })
+            # --- Result aggregation ---
+            record = {
+                "provider": "OPENROOM",
+                "links": [link],
+                "tenantName": metadata.get("tenant"),
+                "landlord": metadata.get("landlord"),
+                "caseId": metadata.get("fileNumber"),
+                "address": metadata.get("address"),
+                "topic": metadata.get("topic"),
+                "amountOwed": metadata.get("amountOwed"),
+                "courtOrderImages": cloud_imgs
+            }
+            if image_job_id:
+                record["imageJobId"] = image_job_id
+                record["imageStatus"] = "queued"
+        except Exception as e:
+            SCRAPER_CASE_FAILURES.labels("OPENROOM").inc()
+            print(f"[OpenRoom Error] Failed scraping {link}: {e}")
+        finally:
+            if case_page is not None:
+                await browser_pool.close_page(case_page)
+
+        if record is not None:
+            SCRAPER_CASES.labels("OPENROOM").inc()
+            yield {"event": "case", "provider": "OPENROOM", "data": record}
+        yield {"event": "progress", "provider": "OPENROOM", "page": 1, "done": done, "total": len(links)}
 
-                await case_page.close()
-            except Exception as e:
-                print(f"[OpenRoom Error] Failed scraping {link}: {e}")
 
-        await browser.close()
-    return results
+async def scrape_openroom(name: str, defer_images: bool = False):
+    return await collect_cases(iter_openroom(name, defer_images))
 
 # ----------------------------------------
-# 2 Quebec (CanLII)
+# CanLII decision pages (shared by the CanLII scrapers)
 # ----------------------------------------
-async def scrape_quebec(name: str):
-    results = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-        await page.goto("https://www.canlii.org/qc", wait_until="domcontentloaded")
+# Max detail pages in flight per provider for one search.
+CANLII_DETAIL_CONCURRENCY = {
+    "CANLII-QUEBEC": int(os.getenv("CANLII_QC_DETAIL_CONCURRENCY", "4")),
+    "CANLII-ALBERTA": int(os.getenv("CANLII_AB_DETAIL_CONCURRENCY", "4")),
+    "CANLII-BC": int(os.getenv("CANLII_BC_DETAIL_CONCURRENCY", "4")),
+}
+
+
+# "auto" tries a plain HTTP fetch first and falls back to Playwright,
+# "http" / "browser" force one path.
+CANLII_FETCH_MODE = os.getenv("CANLII_FETCH_MODE", "auto").lower()
+CANLII_HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-CA,en;q=0.9,fr-CA;q=0.8",
+}
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_http_client = None
+
+
+def get_http_client():
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(20.0, connect=10.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers=CANLII_HTTP_HEADERS,
+            follow_redirects=True,
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# Tags whose boundaries become line breaks in innerText
+HTML_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "ol",
+    "p", "pre", "section", "table", "tr", "td", "th", "ul",
+}
+HTML_SKIP_TAGS = {"script", "style", "noscript", "template", "head"}
+
+
+def html_inner_text(node) -> str:
+    # Rough equivalent of innerText for server-rendered markup
+    parts = []
+
+    def walk(el):
+        tag = el.tag if isinstance(el.tag, str) else None
+        if tag in HTML_SKIP_TAGS:
+            if el.tail:
+                parts.append(el.tail)
+            return
+        if tag in HTML_BLOCK_TAGS:
+            parts.append("\n")
+        if tag and el.text:
+            parts.append(el.text)
+        for child in el:
+            walk(child)
+        if tag in HTML_BLOCK_TAGS:
+            parts.append("\n")
+        if el.tail:
+            parts.append(el.tail)
+
+    if node.text:
+        parts.append(node.text)
+    for child in node:
+        walk(child)
+    return "".join(parts).strip()
+
+
+def parse_decision_html(html: str):
+    if not html:
+        return None
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except Exception:
+        return None
+    nodes = doc.xpath('//*[@id="originalDocument"]')
+    if not nodes:
+        return None
+    return html_inner_text(nodes[0]) or None
 
-        # Wait for and handle cookie popup
-        try:
-            if await page.is_visible("#cookieConsentContainer"):
-                await page.click("#cookieConsentContainer button.btn")
-                await page.wait_for_selector("#cookieConsentContainer", state="hidden", timeout=5000)
-                print("[Cookie] Consent accepted.")
-        except Exception as e:
-            print("[Cookie] Failed to handle popup:", e)
 
-        # Perform search
-        await page.wait_for_selector("#idInput")
-        await page.fill("#idInput", name)
-        await page.keyboard.press("Enter")
+async def fetch_decision_text_http(case_url: str, log_tag: str):
+    try:
+        response = await scheduled_get(get_http_client(), case_url)
+        if response.status_code != 200:
+            print(f"[{log_tag} HTTP] {response.status_code} for {case_url}")
+            return None
+        return parse_decision_html(response.text)
+    except Exception as e:
+        print(f"[{log_tag} HTTP] Fetch failed: {case_url} → {e}")
+        return None
 
-        await page.wait_for_selector("li.result", timeout=15000)
 
-        # Try to click on the "Decisions" filter
-        try:
-            await page.click("#typeFacetItem-decision a", timeout=5000)
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"[Click Fallback] Normal click failed: {e}")
-            try:
-                await page.evaluate("""
-                    () => document.querySelector('#typeFacetItem-decision a')?.click()
-                """)
-                await asyncio.sleep(2)
-                print("[Click Fallback] Clicked using JS.")
-            except Exception as e2:
-                print("[Click Fallback] JS click also failed:", e2)
-
-        summaries = await page.evaluate("""
-            () => Array.from(document.querySelectorAll('li.result')).map(el => {
-                const nameAnchor = el.querySelector(".name a");
-                const citation = el.querySelector(".reference")?.innerText || null;
-                const context = el.querySelectorAll(".context");
-                const tribunal = context[0]?.innerText || null;
-                const date = context[1]?.innerText || null;
-                const keywords = el.querySelector(".keywords")?.innerText || null;
-                return {
-                    caseName: nameAnchor?.innerText || null,
-                    caseUrl: nameAnchor ? "https://www.canlii.org" + nameAnchor.getAttribute("href") : null,
-                    citation,
-                    tribunal,
-                    date,
-                    keywords
-                };
-            })
-        """)
-
-
-
-        for summary in summaries:
-            full_text = None
-            if summary["caseUrl"]:
-                try:
-                    case_page = await browser.new_page()
-                    await case_page.goto(summary["caseUrl"], wait_until="domcontentloaded")
-                    await case_page.wait_for_selector("#originalDocument", timeout=20000)
-                    full_text = await case_page.locator("#originalDocument").inner_text()
-                    await case_page.close()
-                except Exception as e:
-                    print(f"[Quebec Error] Could not load full text: {summary['caseUrl']} → {e}")
+# Runs the snippet extraction inside the page so only the snippet, its offsets
+# and the lengths cross the DevTools protocol instead of the whole judgment.
+# Mirrors clean_text_preserve_meaning (same whitespace set, anchors and [n]
+# fallback); check_fetch_parity.py compares both on the saved fixtures.
+DECISION_SNIPPET_JS = r"""
+(el, {maxLength, contextChars, paragraphCount}) => {
+    const WS = '\t\n\x0b\x0c\r\x1c-\x20\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000';
+    const strip = (s) => s.replace(new RegExp('^[' + WS + ']+|[' + WS + ']+$', 'g'), '');
+    const raw = el ? el.innerText : '';
+    if (!raw) return null;
+    const text = strip(raw.replace(/[\n\r\t]+/g, ' ').replace(new RegExp('[' + WS + ']{2,}', 'g'), ' '));
+
+    let anchor = /POUR CES MOTIFS/iu.exec(text);
+    let endRe = /Présence|Me(?![\p{L}\p{N}_])|Dated/giu;
+    if (!anchor) {
+        anchor = /Conclusion/iu.exec(text);
+        endRe = /Dated|Signed|Respectfully submitted/giu;
+    }
 
-            results.append({
-                "provider": "CANLII-QUEBEC",
-                "caseName": summary["caseName"],
-                "citation": summary["citation"],
-                "tribunal": summary["tribunal"],
-                "date": summary["date"],
-                "keywords": summary["keywords"],
-                "caseUrl": summary["caseUrl"],
-                "fullTextSnippet": clean_text_preserve_meaning(full_text)
+    let snippet, start = null, end = null;
+    if (anchor) {
+        endRe.lastIndex = anchor.index + anchor[0].length;
+        const terminator = endRe.exec(text);
+        start = Math.max(0, anchor.index - contextChars);
+        end = terminator ? terminator.index + terminator[0].length : text.length;
+        snippet = text.slice(start, end);
+    } else {
+        const paragraphs = [];
+        for (const match of text.matchAll(/\[\p{Nd}+\][^\[]+/gu)) {
+            paragraphs.push(match[0]);
+            if (paragraphs.length > paragraphCount) paragraphs.shift();
+        }
+        snippet = paragraphs.length ? paragraphs.join(' ') : text.slice(-maxLength);
+    }
 
-            })
-        await browser.close()
-    return results
+    return {
+        snippet: strip(snippet).slice(0, maxLength) + (snippet.length > maxLength ? '…' : ''),
+        start,
+        end,
+        totalLength: text.length,
+        rawLength: raw.length,
+    };
+}
+"""
+
+
+async def fetch_decision_browser(context, case_url: str, log_tag: str, full_text: bool = False,
+                                 provider: str = "CANLII"):
+    case_page = None
+    try:
+        with stage(provider, "detail_browser"):
+            case_page = await browser_pool.new_page(context)
+            await scheduled_goto(case_page, case_url, wait_until="domcontentloaded")
+            await case_page.wait_for_selector("#originalDocument", timeout=20000)
+            document = case_page.locator("#originalDocument")
+            if full_text:
+                raw_text = await document.inner_text()
+            else:
+                extracted = await document.evaluate(DECISION_SNIPPET_JS, {
+                    "maxLength": 10000,
+                    "contextChars": SNIPPET_CONTEXT_CHARS,
+                    "paragraphCount": SNIPPET_FALLBACK_PARAGRAPHS,
+                })
+                return None, extracted["snippet"] if extracted else ""
+        with stage(provider, "clean"):
+            return raw_text, clean_text_preserve_meaning(raw_text)
+    except Exception as e:
+        SCRAPER_CASE_FAILURES.labels(provider).inc()
+        print(f"[{log_tag} Error] Could not load full text: {case_url} → {e}")
+        return None, ""
+    finally:
+        if case_page is not None:
+            await browser_pool.close_page(case_page)
+
+
+# Returns (raw_text, snippet). raw_text is None when the snippet was extracted
+# in the page and full_text was not requested.
+async def fetch_decision(context, case_url: str, log_tag: str, full_text: bool = False, mode: str = None,
+                         provider: str = "CANLII"):
+    mode = (mode or CANLII_FETCH_MODE).lower()
+    if mode in ("auto", "http"):
+        with stage(provider, "detail_http"):
+            raw_text = await fetch_decision_text_http(case_url, log_tag)
+        if raw_text or mode == "http":
+            if not raw_text:
+                SCRAPER_CASE_FAILURES.labels(provider).inc()
+            with stage(provider, "clean"):
+                return raw_text, clean_text_preserve_meaning(raw_text)
+        SCRAPER_FALLBACKS.labels(provider, "detail_browser").inc()
+        print(f"[{log_tag} HTTP] No #originalDocument, falling back to browser: {case_url}")
+    return await fetch_decision_browser(context, case_url, log_tag, full_text, provider)
+
+
+# Decision text is stored on disk once fetched; CanLII decisions rarely change
+# after publication. DOCUMENT_STORE_MAX_AGE_DAYS=0 keeps entries forever.
+DOCUMENT_STORE_PATH = os.getenv("DOCUMENT_STORE_PATH", "decisions.sqlite3")
+DOCUMENT_STORE_MAX_AGE_DAYS = float(os.getenv("DOCUMENT_STORE_MAX_AGE_DAYS", "0"))
+
+
+class DocumentStore(SqliteStore):
+    schema = """
+        CREATE TABLE IF NOT EXISTS decisions (
+            case_url TEXT PRIMARY KEY,
+            raw_text TEXT NOT NULL,
+            snippet TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        )
+    """
+
+    def __init__(self, path: str = DOCUMENT_STORE_PATH, max_age_days: float = DOCUMENT_STORE_MAX_AGE_DAYS):
+        super().__init__(path)
+        self.max_age = max_age_days * 86400
+
+    def _get(self, case_url: str):
+        row = self._fetchone(
+            "SELECT raw_text, snippet, content_hash, fetched_at FROM decisions WHERE case_url = ?",
+            (case_url,),
+        )
+        if row is None:
+            return None
+        if self.max_age and time.time() - row[3] > self.max_age:
+            return None
+        return {"rawText": row[0], "snippet": row[1], "contentHash": row[2], "fetchedAt": row[3]}
+
+    def _put(self, case_url: str, raw_text: str, snippet: str):
+        content_hash = hashlib.sha256((raw_text or snippet).encode("utf-8")).hexdigest()
+        self._execute(
+            "INSERT OR REPLACE INTO decisions (case_url, raw_text, snippet, content_hash, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (case_url, raw_text, snippet, content_hash, time.time()),
+        )
+
+    async def get(self, case_url: str):
+        try:
+            return await asyncio.to_thread(self._get, case_url)
+        except Exception as e:
+            print(f"[Document Store] Read failed for {case_url}: {e}")
+            return None
 
-# ----------------------------------------
-# 3 Quebec (Alberta)
-# ----------------------------------------
+    async def put(self, case_url: str, raw_text: str, snippet: str):
+        try:
+            await asyncio.to_thread(self._put, case_url, raw_text, snippet)
+        except Exception as e:
+            print(f"[Document Store] Write failed for {case_url}: {e}")
 
-async def scrape_alberta(name: str):
-    results = []
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
+document_store = DocumentStore()
 
-        await page.goto("https://www.canlii.org/en/ab/", wait_until="domcontentloaded")
 
-        # Handle cookie popup
-        try:
+# ----------------------------------------
+# 2-4 CanLII (Quebec, Alberta, British Columbia)
+# ----------------------------------------
+# One engine drives every CanLII jurisdiction; adding one (e.g. /en/on/ or
+# /en/mb/) is a new entry here. "paginate" follows a.next through every
+# results page, otherwise only the first page is read. Watchlist runs
+# still read every results page (searches are in relevance order, so a new
+# decision can rank behind known ones) and only skip loading known decisions.
+# "search_url" is the deep link to decision results for {query}.
+CANLII_BASE_URL = os.getenv("CANLII_BASE_URL", "https://www.canlii.org").rstrip("/")
+
+CANLII_JURISDICTIONS = {
+    "quebec": {"provider": "CANLII-QUEBEC", "url": f"{CANLII_BASE_URL}/qc", "log_tag": "Quebec", "paginate": False,
+               "search_url": os.getenv("CANLII_QC_SEARCH_URL", f"{CANLII_BASE_URL}/fr/#search/type=decision&jId=qc&text={{query}}")},
+    "alberta": {"provider": "CANLII-ALBERTA", "url": f"{CANLII_BASE_URL}/en/ab/", "log_tag": "Alberta", "paginate": True,
+                "search_url": os.getenv("CANLII_AB_SEARCH_URL", f"{CANLII_BASE_URL}/en/#search/type=decision&jId=ab&text={{query}}")},
+    "bc": {"provider": "CANLII-BC", "url": f"{CANLII_BASE_URL}/en/bc/", "log_tag": "BC", "paginate": True,
+           "search_url": os.getenv("CANLII_BC_SEARCH_URL", f"{CANLII_BASE_URL}/en/#search/type=decision&jId=bc&text={{query}}")},
+}
+
+CANLII_SUMMARIES_JS = """
+    (base) => Array.from(document.querySelectorAll('li.result')).map(el => {
+        const nameAnchor = el.querySelector(".name a");
+        const citation = el.querySelector(".reference")?.innerText || null;
+        const context = el.querySelectorAll(".context");
+        const tribunal = context[0]?.innerText || null;
+        const date = context[1]?.innerText || null;
+        const keywords = el.querySelector(".keywords")?.innerText || null;
+        return {
+            caseName: nameAnchor?.innerText || null,
+            caseUrl: nameAnchor ? base + nameAnchor.getAttribute("href") : null,
+            citation,
+            tribunal,
+            date,
+            keywords
+        };
+    })
+"""
+
+
+def start_canlii_details(context, summaries, provider: str, log_tag: str, semaphore, full_text: bool = False):
+    async def build(summary):
+        snippet = ""
+        raw_text = None
+        case_url = summary["caseUrl"]
+        if case_url:
+            with stage(provider, "store"):
+                stored = await document_store.get(case_url)
+            # Snippet-only entries are refetched when the full text is wanted
+            if stored is not None and (stored["rawText"] or not full_text):
+                snippet, raw_text = stored["snippet"], stored["rawText"]
+            else:
+                async with semaphore:
+                    raw_text, snippet = await fetch_decision(context, case_url, log_tag, full_text, provider=provider)
+                if raw_text or snippet:
+                    with stage(provider, "store"):
+                        await document_store.put(case_url, raw_text or "", snippet)
+        record = {
+            "provider": provider,
+            "caseName": summary["caseName"],
+            "citation": summary["citation"],
+            "tribunal": summary["tribunal"],
+            "date": summary["date"],
+            "keywords": summary["keywords"],
+            "caseUrl": summary["caseUrl"],
+            "fullTextSnippet": snippet
+        }
+        if full_text:
+            record["fullText"] = raw_text or None
+        return record
+
+    return [asyncio.ensure_future(build(summary)) for summary in summaries]
+
+
+async def dismiss_canlii_cookies(page, provider: str):
+    try:
+        with stage(provider, "cookie"):
             if await page.is_visible("#cookieConsentContainer"):
                 await page.click("#cookieConsentContainer button.btn")
                 await page.wait_for_selector("#cookieConsentContainer", state="hidden", timeout=5000)
                 print("[Cookie] Consent accepted.")
-        except Exception as e:
-            print("[Cookie] Failed to handle popup:", e)
+    except Exception as e:
+        print("[Cookie] Failed to handle popup:", e)
+
+
+# The search app's answer to a query without hits: an element matching
+# CANLII_NO_RESULTS_SELECTOR, or one of the messages below in the page text
+CANLII_NO_RESULTS_SELECTOR = os.getenv("CANLII_NO_RESULTS_SELECTOR", "#noResults, .noResults, .no-results")
+CANLII_NO_RESULTS_TEXT = ["no results found", "aucun résultat"]
+
+# Resolves to "results" or "empty" as soon as the page shows either
+CANLII_RESULTS_OR_EMPTY_JS = """
+    ({selector, texts}) => {
+        if (document.querySelector('li.result')) return 'results';
+        if (selector && document.querySelector(selector)) return 'empty';
+        const text = (document.body?.innerText || '').toLowerCase();
+        return texts.some(t => text.includes(t)) ? 'empty' : false;
+    }
+"""
+
+
+# Every result links under the jurisdiction's path segment (/qc/, /ab/...)
+def canlii_results_match(summaries, config):
+    segment = "/" + urlparse(config["url"]).path.strip("/").rsplit("/", 1)[-1] + "/"
+    return all(segment in urlparse(s["caseUrl"] or "").path for s in summaries)
 
-        # Search
+
+# Returns "results", "empty" (the search ran and found nothing), "mismatch"
+# (the page isn't the search that was asked for) or None when the deep link
+# didn't lead to a results page
+async def open_canlii_deep_link(page, config, name: str):
+    provider, log_tag = config["provider"], config["log_tag"]
+    url = deep_link_url(config["search_url"], name)
+    try:
+        with stage(provider, "deep_link"):
+            # A reused page may already show results from the same search
+            # app; a hash-only change wouldn't reload it and old li.result
+            # entries would match right away
+            if page.url.split("#")[0] == url.split("#")[0]:
+                await page.goto("about:blank")
+            await scheduled_goto(page, url, wait_until="domcontentloaded")
+            handle = await page.wait_for_function(
+                CANLII_RESULTS_OR_EMPTY_JS,
+                arg={"selector": CANLII_NO_RESULTS_SELECTOR, "texts": CANLII_NO_RESULTS_TEXT},
+                timeout=DEEP_LINK_TIMEOUT_MS,
+            )
+            outcome = await handle.json_value()
+    except Exception as e:
+        print(f"[{log_tag}] Deep link found no results: {e}")
+        return None
+    if not await page_shows_query(page, name):
+        return "mismatch"
+    if outcome == "results" and not canlii_results_match(await page.evaluate(CANLII_SUMMARIES_JS, CANLII_BASE_URL), config):
+        return "mismatch"
+    if outcome == "results":
+        # The banner can still cover a.next before any state was saved
+        await dismiss_canlii_cookies(page, provider)
+    return outcome
+
+
+async def open_canlii_search(page, config, name: str):
+    provider = config["provider"]
+    if not deep_links.usable(provider, config.get("search_url")):
+        return await open_canlii_search_ui(page, config, name)
+    outcome = await open_canlii_deep_link(page, config, name)
+    if outcome == "results":
+        deep_links.record(provider, "ok")
+        return True
+    if outcome == "empty":
+        # The search ran and said so; the UI would only wait out its timeout
+        deep_links.record(provider, "empty")
+        return False
+    if outcome == "mismatch":
+        deep_links.record(provider, "mismatch")
+    SCRAPER_FALLBACKS.labels(provider, "ui_search").inc()
+    found = await open_canlii_search_ui(page, config, name)
+    deep_links.record(provider, "broken" if found else "failed")
+    return found
+
+
+# Home page, consent banner, search box, then the "Decisions" facet
+async def open_canlii_search_ui(page, config, name: str):
+    provider, log_tag = config["provider"], config["log_tag"]
+    with stage(provider, "goto"):
+        await scheduled_goto(page, config["url"], wait_until="domcontentloaded")
+
+    # Handle cookie popup
+    await dismiss_canlii_cookies(page, provider)
+
+    # Search
+    with stage(provider, "search"):
         await page.wait_for_selector("#idInput")
         await page.fill("#idInput", name)
-        await page.keyboard.press("Enter")
-        await page.wait_for_selector("li.result", timeout=15000)
 
-        # Click "Decisions" filter
+    # The search either lists results or says it found none; anything else
+    # within the timeout is an error, not an empty search
+    with stage(provider, "results"):
+        async with host_scheduler.slot(config["url"], measure_latency=False):
+            await page.keyboard.press("Enter")
+        handle = await page.wait_for_function(
+            CANLII_RESULTS_OR_EMPTY_JS,
+            arg={"selector": CANLII_NO_RESULTS_SELECTOR, "texts": CANLII_NO_RESULTS_TEXT},
+            timeout=15000,
+        )
+    if await handle.json_value() == "empty":
+        print(f"[{log_tag}] No results.")
+        return False
+
+    # Click "Decisions" filter
+    with stage(provider, "facet"):
+        before = await results_signature(page)
         try:
-            await page.click("#typeFacetItem-decision a", timeout=5000)
-            await asyncio.sleep(2)
+            async with host_scheduler.slot(config["url"], measure_latency=False, timeout_is_failure=False):
+                await page.click("#typeFacetItem-decision a", timeout=5000)
+            await wait_until_ready(page, "canlii.facet", changed_from=before, quiet_ms=1500)
         except Exception as e:
-            print(f"[Click Fallback] Normal click failed: {e}")
+            print(f"[{log_tag}] Filter click failed: {e}")
+            if is_timeout(e):
+                SCRAPER_TIMEOUTS.labels(provider, "facet").inc()
+            SCRAPER_FALLBACKS.labels(provider, "facet_js_click").inc()
             try:
-                await page.evaluate("() => document.querySelector('#typeFacetItem-decision a')?.click()")
-                await asyncio.sleep(2)
+                async with host_scheduler.slot(config["url"], measure_latency=False):
+                    await page.evaluate("() => document.querySelector('#typeFacetItem-decision a')?.click()")
+                await wait_until_ready(page, "canlii.facet", changed_from=before, quiet_ms=1500)
+                print(f"[{log_tag}] Clicked filter using JS.")
             except Exception as e2:
-                print("[Click Fallback] JS click also failed:", e2)
+                print(f"[{log_tag}] JS click also failed:", e2)
+    return True
 
-        # Loop through all pages
-        while True:
-            await page.wait_for_selector("li.result")
-
-            summaries = await page.evaluate("""
-                () => Array.from(document.querySelectorAll('li.result')).map(el => {
-                    const nameAnchor = el.querySelector(".name a");
-                    const citation = el.querySelector(".reference")?.innerText || null;
-                    const context = el.querySelectorAll(".context");
-                    const tribunal = context[0]?.innerText || null;
-                    const date = context[1]?.innerText || null;
-                    const keywords = el.querySelector(".keywords")?.innerText || null;
-                    return {
-                        caseName: nameAnchor?.innerText || null,
-                        caseUrl: nameAnchor ? "https://www.canlii.org" + nameAnchor.getAttribute("href") : null,
-                        citation,
-                        tribunal,
-                        date,
-                        keywords
-                    };
-                })
-            """)
 
-            for summary in summaries:
-                full_text = None
-                if summary["caseUrl"]:
-                    try:
-                        case_page = await browser.new_page()
-                        await case_page.goto(summary["caseUrl"], wait_until="domcontentloaded")
-                        await case_page.wait_for_selector("#originalDocument", timeout=20000)
-                        full_text = await case_page.locator("#originalDocument").inner_text()
-                        await case_page.close()
-                    except Exception as e:
-                        print(f"[Alberta Error] Could not load full text: {summary['caseUrl']} → {e}")
-
-                results.append({
-                    "provider": "CANLII-ALBERTA",
-                    "caseName": summary["caseName"],
-                    "citation": summary["citation"],
-                    "tribunal": summary["tribunal"],
-                    "date": summary["date"],
-                    "keywords": summary["keywords"],
-                    "caseUrl": summary["caseUrl"],
-                    "fullTextSnippet": clean_text_preserve_meaning(full_text)
-                })
+async def read_canlii_summaries(page):
+    await page.wait_for_selector("li.result")
+    return await page.evaluate(CANLII_SUMMARIES_JS, CANLII_BASE_URL)
 
-            # Pagination
-            try:
-                next_button = await page.query_selector("a.next")
-                if next_button:
-                    await next_button.click()
-                    await asyncio.sleep(3)
+
+async def next_canlii_summaries(page, provider: str, log_tag: str):
+    # Returns the next results page, or None when there is none
+    try:
+        next_button = await page.query_selector("a.next")
+        if not next_button:
+            return None
+        with stage(provider, "pagination"):
+            before = await results_signature(page)
+            async with host_scheduler.slot(page.url, measure_latency=False):
+                await next_button.click()
+            await wait_until_ready(page, "canlii.next_page", changed_from=before)
+            return await read_canlii_summaries(page)
+    except Exception as e:
+        print(f"[{log_tag} Pagination] No next page or failed:", e)
+        return None
+
+
+# known (watchlist mode): caseUrl -> watch_hash of results already seen for
+# this name; unchanged results are skipped without loading their decision.
+async def iter_canlii(jurisdiction: str, name: str, full_text: bool = False, known: dict = None,
+                      start_page: int = 1, offset: int = 0, limit: int = None):
+    config = CANLII_JURISDICTIONS[jurisdiction]
+    started = time.perf_counter()
+    async with browser_pool.acquire(**storage_states.context_options("CANLII")) as context:
+        observe_stage(config["provider"], "browser", started)
+        await apply_route_policy(context, "CANLII")
+        page = await browser_pool.new_page(context, capped=False)
+        try:
+            async for event in iter_canlii_session(context, page, config, name, full_text, known,
+                                                   start_page=start_page, offset=offset, limit=limit):
+                yield event
+        finally:
+            await browser_pool.close_page(page)
+
+
+# One search on an already open page. Batch runs reuse the page, its context
+# (the cookie consent is only answered once) and the detail semaphore.
+#
+# start_page/offset/limit read one slice of the results: earlier results pages
+# are stepped through without loading any decision, and the crawl stops once
+# limit cases are out. A final "cursor" event then gives the page and offset
+# where the next slice starts (page None when the results are exhausted).
+async def iter_canlii_session(context, page, config, name: str, full_text: bool = False, known: dict = None,
+                              semaphore=None, start_page: int = 1, offset: int = 0, limit: int = None):
+    provider, log_tag = config["provider"], config["log_tag"]
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, CANLII_DETAIL_CONCURRENCY.get(provider, 4)))
+
+    if not await open_canlii_search(page, config, name):
+        return
+    await storage_states.save("CANLII", context)
+
+    summaries = await read_canlii_summaries(page)
+    page_number = 1
+    while summaries is not None and page_number < start_page:
+        summaries = await next_canlii_summaries(page, provider, log_tag) if config["paginate"] else None
+        page_number += 1
+    page_number -= 1
+
+    remaining = limit
+    tasks = []
+    next_page = None
+    try:
+        while summaries is not None:
+            page_number += 1
+            first = offset if page_number == start_page else 0
+            window = summaries[first:] if remaining is None else summaries[first:first + remaining]
+            limit_reached = remaining is not None and len(window) >= remaining
+            fresh = window
+            if known is not None:
+                fresh = [s for s in window if known.get(s["caseUrl"]) != watch_hash(provider, s)]
+            tasks = start_canlii_details(context, fresh, provider, log_tag, semaphore, full_text)
+            # Read the next results page while this page's decisions load
+            if config["paginate"] and not limit_reached:
+                next_page = asyncio.ensure_future(next_canlii_summaries(page, provider, log_tag))
+
+            page_event = {"event": "page", "provider": provider, "page": page_number, "count": len(summaries)}
+            if known is not None:
+                page_event["skipped"] = len(summaries) - len(fresh)
+            yield page_event
+            # Cases are yielded in result order, each as soon as it and
+            # the ones before it are done.
+            for done, task in enumerate(tasks, start=1):
+                record = await task
+                SCRAPER_CASES.labels(provider).inc()
+                yield {"event": "case", "provider": provider, "data": record}
+                yield {"event": "progress", "provider": provider, "page": page_number, "done": done, "total": len(fresh)}
+
+            if limit_reached:
+                end = first + len(window)
+                if end < len(summaries):
+                    cursor_page, cursor_offset = page_number, end
+                elif config["paginate"] and await page.query_selector("a.next"):
+                    cursor_page, cursor_offset = page_number + 1, 0
                 else:
-                    break
-            except Exception as e:
-                print("[Pagination] No next page or failed:", e)
-                break
+                    cursor_page, cursor_offset = None, 0
+                yield {"event": "cursor", "provider": provider, "page": cursor_page, "offset": cursor_offset}
+                return
+            if remaining is not None:
+                remaining -= len(window)
 
-        await browser.close()
+            summaries = await next_page if next_page is not None else None
+            next_page = None
+        if limit is not None:
+            yield {"event": "cursor", "provider": provider, "page": None, "offset": 0}
+    finally:
+        # Wait for the cancelled fetches to close their pages and release
+        # their host slots before the context goes back to the pool
+        pending = [task for task in tasks if not task.done()]
+        if next_page is not None and not next_page.done():
+            pending.append(next_page)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
-    return results
 
+def iter_quebec(name: str):
+    return iter_canlii("quebec", name)
 
-# ----------------------------------------
-# 4 British Columbia (CanLII)
-# ----------------------------------------
 
-async def scrape_british_columbia(name: str):
-    results = []
+def iter_alberta(name: str):
+    return iter_canlii("alberta", name)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"])
-        context = await browser.new_context()
-        page = await context.new_page()
 
-        await page.goto("https://www.canlii.org/en/bc/", wait_until="domcontentloaded")
+def iter_british_columbia(name: str):
+    return iter_canlii("bc", name)
 
-        # Handle cookie popup (optional but safe)
-        try:
-            if await page.is_visible("#cookieConsentContainer"):
-                await page.click("#cookieConsentContainer button.btn")
-                await page.wait_for_selector("#cookieConsentContainer", state="hidden", timeout=5000)
-        except Exception as e:
-            print("[Cookie] Skipped or failed:", e)
 
-        # Search
-        await page.wait_for_selector("#idInput")
-        await page.fill("#idInput", name)
-        await page.keyboard.press("Enter")
+async def scrape_quebec(name: str):
+    return await collect_cases(iter_quebec(name))
 
-        # Wait for search results to load
-        try:
-            await page.wait_for_selector("li.result", timeout=15000)
-        except Exception as e:
-            print(f"[BC] No results or timeout: {e}")
-            await browser.close()
-            return []
 
-        # Try to click "Decisions" filter
-        try:
-            await page.click("#typeFacetItem-decision a", timeout=5000)
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"[BC] Filter click failed: {e}")
-            try:
-                await page.evaluate("() => document.querySelector('#typeFacetItem-decision a')?.click()")
-                await asyncio.sleep(2)
-            except Exception as e2:
-                print("[BC] JS click also failed:", e2)
+async def scrape_alberta(name: str):
+    return await collect_cases(iter_alberta(name))
 
-        # Loop through result pages
-        while True:
-            await page.wait_for_selector("li.result")
-
-            summaries = await page.evaluate("""
-                () => Array.from(document.querySelectorAll('li.result')).map(el => {
-                    const nameAnchor = el.querySelector(".name a");
-                    const citation = el.querySelector(".reference")?.innerText || null;
-                    const context = el.querySelectorAll(".context");
-                    const tribunal = context[0]?.innerText || null;
-                    const date = context[1]?.innerText || null;
-                    const keywords = el.querySelector(".keywords")?.innerText || null;
-                    return {
-                        caseName: nameAnchor?.innerText || null,
-                        caseUrl: nameAnchor ? "https://www.canlii.org" + nameAnchor.getAttribute("href") : null,
-                        citation,
-                        tribunal,
-                        date,
-                        keywords
-                    };
-                })
-            """)
 
-            for summary in summaries:
-                full_text = None
-                if summary["caseUrl"]:
-                    try:
-                        case_page = await browser.new_page()
-                        await case_page.goto(summary["caseUrl"], wait_until="domcontentloaded")
-                        await case_page.wait_for_selector("#originalDocument", timeout=20000)
-                        full_text = await case_page.locator("#originalDocument").inner_text()
-                        await case_page.close()
-                    except Exception as e:
-                        print(f"[BC Error] Could not load full text: {summary['caseUrl']} → {e}")
-
-                results.append({
-                    "provider": "CANLII-BC",
-                    "caseName": summary["caseName"],
-                    "citation": summary["citation"],
-                    "tribunal": summary["tribunal"],
-                    "date": summary["date"],
-                    "keywords": summary["keywords"],
-                    "caseUrl": summary["caseUrl"],
-                    "fullTextSnippet": clean_text_preserve_meaning(full_text)
-                })
+async def scrape_british_columbia(name: str):
+    return await collect_cases(iter_british_columbia(name))
 
-            # Pagination
-            try:
-                next_button = await page.query_selector("a.next")
-                if next_button:
-                    await next_button.click()
-                    await asyncio.sleep(3)
-                else:
-                    break
-            except Exception as e:
-                print("[BC Pagination] No next page or failed:", e)
-                break
 
-        await browser.close()
+async def scrape_canlii(jurisdiction: str, name: str, full_text: bool = False):
+    return await collect_cases(iter_canlii(jurisdiction, name, full_text))
 
-    return results
 
+# Cursors are opaque to clients: urlsafe base64 of the jurisdiction, the
+# normalized name and where the next slice starts (results page, offset).
+def encode_canlii_cursor(jurisdiction: str, name: str, page: int, offset: int):
+    payload = json.dumps({"j": jurisdiction, "n": " ".join(name.lower().split()), "p": page, "o": offset})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_canlii_cursor(cursor: str, jurisdiction: str, name: str):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        page, offset = int(data["p"]), int(data["o"])
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if data.get("j") != jurisdiction or data.get("n") != " ".join(name.lower().split()):
+        raise ValueError("Cursor belongs to a different search")
+    if page < 1 or offset < 0:
+        raise ValueError("Malformed cursor")
+    return page, offset
+
+
+async def scrape_canlii_slice(jurisdiction: str, name: str, limit: int, cursor: str = None, full_text: bool = False):
+    start_page, offset = decode_canlii_cursor(cursor, jurisdiction, name) if cursor else (1, 0)
+    cases, next_cursor = [], None
+    events = iter_canlii(jurisdiction, name, full_text, start_page=start_page, offset=offset, limit=limit)
+    async for event in events:
+        if event["event"] == "case":
+            cases.append(event["data"])
+        elif event["event"] == "cursor" and event["page"] is not None:
+            next_cursor = encode_canlii_cursor(jurisdiction, name, event["page"], event["offset"])
+    return {"results": cases, "nextCursor": next_cursor}
 
 
-import re
 
 def clean_and_extract_decision(text: str, max_length: int = 10000) -> str:
     if not text:
@@ -452,43 +2319,737 @@ def clean_and_extract_decision(text: str, max_length: int = 10000) -> str:
     return text.strip()[:max_length]
 
 
+# Decision snippet extraction. Output is identical to the original
+# re.sub/re.search version; the work is one whitespace pass, one lowercase
+# copy searched with str.find for the anchors, a short terminator search
+# after the anchor, and a [n] paragraph fallback that walks back from the end.
+# Plain str operations are used where they beat the regex engine in CPython.
+OLD_WHITESPACE_RUN_RE = re.compile(r'[\n\r\t]+')
+WHITESPACE_RUN_RE = re.compile(r'\s{2,}')
+# Whitespace other than " \n\r\t": a single one of these must be kept as is
+ODD_WHITESPACE_RE = re.compile('[\x0b\x0c\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]')
+# str.lower() disagrees with re.IGNORECASE on these (İ changes length, ı/ſ
+# match i/s case-insensitively), so texts containing them use the regexes
+CASEFOLD_UNSAFE_CHARS = ("\u0130", "\u0131", "\u017f")
+FR_SNIPPET_ANCHOR = "POUR CES MOTIFS"
+EN_SNIPPET_ANCHOR = "Conclusion"
+FR_SNIPPET_ANCHOR_RE = re.compile(FR_SNIPPET_ANCHOR, re.IGNORECASE)
+EN_SNIPPET_ANCHOR_RE = re.compile(EN_SNIPPET_ANCHOR, re.IGNORECASE)
+FR_SNIPPET_END_RE = re.compile(r"Présence|Me\b|Dated", re.IGNORECASE)
+EN_SNIPPET_END_RE = re.compile(r"Dated|Signed|Respectfully submitted", re.IGNORECASE)
+FR_SNIPPET_TERMINATORS = ("présence", "dated")
+EN_SNIPPET_TERMINATORS = ("dated", "signed", "respectfully submitted")
+WORD_CHAR_RE = re.compile(r'\w')
+PARAGRAPH_RE = re.compile(r'\[\d+\][^\[]+')
+SNIPPET_CONTEXT_CHARS = 1000
+SNIPPET_FALLBACK_PARAGRAPHS = 6
+
+
+def normalize_whitespace(text: str) -> str:
+    if ODD_WHITESPACE_RE.search(text) is None:
+        return ' '.join(text.split())
+    text = OLD_WHITESPACE_RUN_RE.sub(' ', text)
+    return WHITESPACE_RUN_RE.sub(' ', text).strip()
+
+
+def find_snippet_anchor(text: str):
+    # Returns (start, end) of the snippet around the first French anchor, or
+    # the first English one when there is no French anchor, else None.
+    if any(c in text for c in CASEFOLD_UNSAFE_CHARS):
+        match = FR_SNIPPET_ANCHOR_RE.search(text)
+        end_re = FR_SNIPPET_END_RE
+        if match is None:
+            match = EN_SNIPPET_ANCHOR_RE.search(text)
+            end_re = EN_SNIPPET_END_RE
+        if match is None:
+            return None
+        start, anchor_end = match.start(), match.end()
+        terminator = end_re.search(text, anchor_end)
+        end = terminator.end() if terminator else len(text)
+        return max(0, start - SNIPPET_CONTEXT_CHARS), end
+
+    lowered = text.lower()
+    start = lowered.find(FR_SNIPPET_ANCHOR.lower())
+    anchor, terminators = FR_SNIPPET_ANCHOR, FR_SNIPPET_TERMINATORS
+    if start < 0:
+        start = lowered.find(EN_SNIPPET_ANCHOR.lower())
+        anchor, terminators = EN_SNIPPET_ANCHOR, EN_SNIPPET_TERMINATORS
+    if start < 0:
+        return None
+    anchor_end = start + len(anchor)
+
+    # Earliest terminator after the anchor; at most one can start at a given
+    # position since they all begin with different letters.
+    end = len(text)
+    for word in terminators:
+        pos = lowered.find(word, anchor_end, end)
+        if pos >= 0:
+            end = pos + len(word)
+    # "Me\b": only a "me" that ends a word counts
+    if terminators is FR_SNIPPET_TERMINATORS:
+        pos = lowered.find("me", anchor_end, end)
+        while pos >= 0:
+            if pos + 2 >= len(text) or not WORD_CHAR_RE.match(text, pos + 2):
+                end = pos + 2
+                break
+            pos = lowered.find("me", pos + 1, end)
+    return max(0, start - SNIPPET_CONTEXT_CHARS), end
+
+
+def last_paragraphs(text: str, count: int):
+    # Every "[" that starts a valid [n] paragraph is a findall() match running
+    # to the next "[", so the last matches can be found from the end.
+    paragraphs = []
+    pos = len(text)
+    while len(paragraphs) < count:
+        pos = text.rfind("[", 0, pos)
+        if pos < 0:
+            break
+        match = PARAGRAPH_RE.match(text, pos)
+        if match:
+            paragraphs.append(match.group())
+    paragraphs.reverse()
+    return paragraphs
+
+
 def clean_text_preserve_meaning(text: str, max_length: int = 10000) -> str:
     if not text:
         return ""
 
     # Clean up the text first
-    text = re.sub(r'[\n\r\t]+', ' ', text)
-    text = re.sub(r'\s{2,}', ' ', text).strip()
+    text = normalize_whitespace(text)
 
     # Try to extract from "POUR CES MOTIFS" (French) or "Conclusion" (English)
-    fr_match = re.search(r"(POUR CES MOTIFS.*?)(Présence|Me\b|Dated|$)", text, re.IGNORECASE)
-    en_match = re.search(r"(Conclusion.*?)(Dated|Signed|Respectfully submitted|$)", text, re.IGNORECASE)
-
-    snippet = None
-
-    if fr_match:
-        # Also try to get a few paragraphs before "POUR CES MOTIFS"
-        start_idx = max(0, fr_match.start() - 1000)
-        snippet = text[start_idx:fr_match.end()]
-    elif en_match:
-        start_idx = max(0, en_match.start() - 1000)
-        snippet = text[start_idx:en_match.end()]
+    bounds = find_snippet_anchor(text)
+    if bounds:
+        snippet = text[bounds[0]:bounds[1]]
     else:
         # fallback: last few [xx] paragraphs
-        paragraphs = re.findall(r'\[\d+\][^\[]+', text)
-        snippet = ' '.join(paragraphs[-6:]) if paragraphs else text[-max_length:]
+        paragraphs = last_paragraphs(text, SNIPPET_FALLBACK_PARAGRAPHS)
+        snippet = ' '.join(paragraphs) if paragraphs else text[-max_length:]
 
     return snippet.strip()[:max_length] + ("…" if len(snippet) > max_length else "")
 
 
+# ----------------------------------------
+# Result cache (TTL + LRU, single-flight)
+# ----------------------------------------
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "900"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+# Empty or degraded results are kept only this long (0: not cached), so a
+# transient provider slowdown isn't served as "no cases" for the full TTL
+RESULT_CACHE_NEGATIVE_TTL = float(os.getenv("RESULT_CACHE_NEGATIVE_TTL", "60"))
+
+
+# No cases at all, or a CanLII record whose decision text couldn't be loaded
+def is_degraded(value):
+    records = value.get("results") if isinstance(value, dict) else value
+    if not records:
+        return True
+    return any(isinstance(record, dict) and record.get("fullTextSnippet") == "" for record in records)
+
+
+# Storage interface for the result cache. A shared store (Redis, memcached...)
+# only needs to implement these three coroutines to be used by several workers.
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str):
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value, ttl: float):
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()  # key -> (expires_at, stored_at, value)
+
+    async def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, stored_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return stored_at, value
+
+    async def set(self, key: str, value, ttl: float):
+        now = time.monotonic()
+        self._entries[key] = (now + ttl, now, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+
+class ResultCache:
+    def __init__(self, backend: CacheBackend, ttl: float = RESULT_CACHE_TTL,
+                 negative_ttl: float = RESULT_CACHE_NEGATIVE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = min(negative_ttl, ttl)
+        self._inflight = {}
+
+    @staticmethod
+    def make_key(provider: str, name: str) -> str:
+        return f"{provider.lower()}:{' '.join(name.lower().split())}"
+
+    # Returns (results, status, age_seconds). Status is HIT, MISS or COALESCED
+    # (an identical crawl was already running and this call awaited it).
+    async def get_or_run(self, provider: str, name: str, scraper):
+        key = self.make_key(provider, name)
+        if self.ttl > 0:
+            cached = await self.backend.get(key)
+            if cached is not None:
+                stored_at, value = cached
+                return value, "HIT", int(time.monotonic() - stored_at)
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            try:
+                return await asyncio.shield(inflight), "COALESCED", 0
+            except asyncio.CancelledError:
+                # The owning request was cancelled (deadline, disconnect);
+                # unless we were cancelled too, take over the crawl.
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await scraper(name)
+            ttl = self.negative_ttl if is_degraded(value) else self.ttl
+            if ttl > 0:
+                await self.backend.set(key, value, ttl)
+            future.set_result(value)
+            return value, "MISS", 0
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting; avoid "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+
+result_cache = ResultCache(MemoryCacheBackend())
+
+SCRAPERS = {
+    "ontario": scrape_openroom,
+    "quebec": scrape_quebec,
+    "alberta": scrape_alberta,
+    "bc": scrape_british_columbia,
+}
+
+STREAMERS = {
+    "ontario": iter_openroom,
+    "quebec": iter_quebec,
+    "alberta": iter_alberta,
+    "bc": iter_british_columbia,
+}
+
+# Jurisdictions added to CANLII_JURISDICTIONS are served without extra code
+for _jurisdiction in CANLII_JURISDICTIONS:
+    SCRAPERS.setdefault(_jurisdiction, partial(scrape_canlii, _jurisdiction))
+    STREAMERS.setdefault(_jurisdiction, partial(iter_canlii, _jurisdiction))
+
+
+# Per-provider deadlines (seconds) for the fan-out mode of /scrape-all
+DEFAULT_PROVIDER_DEADLINE = float(os.getenv("DEFAULT_PROVIDER_DEADLINE", "180"))
+PROVIDER_DEADLINES = {
+    "ontario": float(os.getenv("OPENROOM_DEADLINE", "120")),
+    "quebec": float(os.getenv("CANLII_QC_DEADLINE", "90")),
+    "alberta": float(os.getenv("CANLII_AB_DEADLINE", "180")),
+    "bc": float(os.getenv("CANLII_BC_DEADLINE", "180")),
+}
+
+
+# request_deadline (the ?deadline= of the request) shortens the provider's
+# own deadline, never lengthens it
+async def scrape_with_deadline(province: str, name: str, request_deadline: float = None):
+    # Cases are collected as they are streamed so a timeout still returns
+    # whatever was scraped before the deadline.
+    cases = []
+
+    async def crawl(name):
+        async for event in STREAMERS[province](name):
+            if event["event"] == "case":
+                cases.append(event["data"])
+        return cases
+
+    deadline = PROVIDER_DEADLINES.get(province, DEFAULT_PROVIDER_DEADLINE)
+    if request_deadline is not None:
+        deadline = min(deadline, request_deadline)
+    started = time.monotonic()
+    status = {"deadline": deadline}
+    try:
+        data, cache_status, _ = await asyncio.wait_for(result_cache.get_or_run(province, name, crawl), deadline)
+        status.update({"status": "ok", "cache": cache_status})
+    except asyncio.TimeoutError:
+        print(f"[Fan-out] {province} hit its {deadline}s deadline with {len(cases)} cases")
+        data = list(cases)
+        status.update({"status": "timeout", "partial": True})
+    except Exception as e:
+        print(f"[Fan-out] {province} failed: {e}")
+        data = list(cases)
+        status.update({"status": "error", "partial": bool(data), "details": str(e)})
+    status["count"] = len(data or [])
+    status["elapsedMs"] = int((time.monotonic() - started) * 1000)
+    return data or [], status
+
+
+async def scrape_fanout(name: str, request_deadline: float = None):
+    provinces = list(SCRAPERS)
+    outcomes = await asyncio.gather(*(scrape_with_deadline(province, name, request_deadline) for province in provinces))
+    results = []
+    providers = {}
+    for province, (data, status) in zip(provinces, outcomes):
+        results.extend(data)
+        providers[province] = status
+    return {"results": results, "providers": providers}
+
+
+# collected: when given, cases are appended to it as they are scraped, so a
+# request cut short by its deadline can still return them.
+async def cached_scrape(province: str, name: str, response: Response, full_text: bool = False,
+                        defer_images: bool = False, collected: list = None):
+    key, scraper, streamer = province, SCRAPERS[province], STREAMERS[province]
+    if full_text and province in CANLII_JURISDICTIONS:
+        key, scraper = f"{province}-fulltext", partial(scrape_canlii, province, full_text=True)
+        streamer = partial(iter_canlii, province, full_text=True)
+    elif defer_images and province == "ontario":
+        key, scraper = "ontario-deferred", partial(scrape_openroom, defer_images=True)
+        streamer = partial(iter_openroom, defer_images=True)
+    if collected is not None:
+        scraper = partial(collect_into, streamer, collected)
+    data, status, age = await result_cache.get_or_run(key, name, scraper)
+    response.headers["X-Cache"] = status
+    response.headers["Age"] = str(age)
+    return data
+
+
+# limit/cursor on the CanLII endpoints; a cursor without a limit reads
+# CANLII_DEFAULT_LIMIT cases. Each slice is cached on its own.
+CANLII_DEFAULT_LIMIT = int(os.getenv("CANLII_DEFAULT_LIMIT", "10"))
+CANLII_MAX_LIMIT = int(os.getenv("CANLII_MAX_LIMIT", "100"))
+
+
+async def cached_slice(province: str, name: str, response: Response, limit: int = None, cursor: str = None,
+                       full_text: bool = False):
+    limit = limit or CANLII_DEFAULT_LIMIT
+    try:
+        start_page, offset = decode_canlii_cursor(cursor, province, name) if cursor else (1, 0)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    key = f"{province}{'-fulltext' if full_text else ''}:{start_page}:{offset}:{limit}"
+    scraper = partial(scrape_canlii_slice, province, limit=limit, cursor=cursor, full_text=full_text)
+    data, status, age = await result_cache.get_or_run(key, name, scraper)
+    response.headers["X-Cache"] = status
+    response.headers["Age"] = str(age)
+    return data
+
+
+async def collect_into(streamer, collected: list, name: str):
+    async for event in streamer(name):
+        if event["event"] == "case":
+            collected.append(event["data"])
+    return list(collected)
+
+
+# ----------------------------------------
+# Request deadlines and client disconnects
+# ----------------------------------------
+# The scrape endpoints run their crawl as a task and stop it when the client
+# goes away (polled every DISCONNECT_POLL_INTERVAL seconds) or when the
+# request deadline passes. Cancelling the task unwinds the scraper, which
+# closes its pages and returns its context to the browser pool. Callers that
+# pass partial=true get the cases scraped before the deadline instead of a
+# 504. A cancelled crawl is not cached; requests coalesced onto it take it
+# over (see ResultCache.get_or_run).
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "300"))
+DISCONNECT_POLL_INTERVAL = float(os.getenv("DISCONNECT_POLL_INTERVAL", "1"))
+# Seconds /scrape-all?province=all waits past the deadline for the providers
+# to hand back their partial results
+FANOUT_DEADLINE_GRACE = float(os.getenv("FANOUT_DEADLINE_GRACE", "10"))
+
+REQUEST_CANCELLATIONS = Counter(
+    "request_cancellations_total", "Scrapes cancelled before they finished, by endpoint and reason.",
+    ("endpoint", "reason"))
+
+
+# Returns (result, outcome); outcome is "ok", "deadline" or "disconnected"
+# and result is None unless it is "ok". Exceptions of the scrape propagate.
+async def run_guarded(request: Request, scrape, deadline: float = None):
+    deadline = deadline or REQUEST_DEADLINE
+    task = asyncio.ensure_future(scrape)
+    started = time.monotonic()
+    outcome = "ok"
+    try:
+        while not task.done():
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                outcome = "deadline"
+                break
+            await asyncio.wait({task}, timeout=min(DISCONNECT_POLL_INTERVAL, remaining))
+            if not task.done() and await request.is_disconnected():
+                outcome = "disconnected"
+                break
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    if outcome != "ok":
+        REQUEST_CANCELLATIONS.labels(request.url.path, outcome).inc()
+        print(f"[Request] {request.url.path} cancelled after {time.monotonic() - started:.1f}s ({outcome})")
+        return None, outcome
+    return task.result(), outcome
+
+
+# The /scrape* endpoints: a full search through cached_scrape, or a
+# limit/cursor slice through cached_slice for the CanLII provinces.
+async def guarded_scrape(request: Request, response: Response, province: str, name: str, full_text: bool = False,
+                         limit: int = None, cursor: str = None, deadline: float = None, allow_partial: bool = False,
+                         defer_images: bool = False):
+    collected = []
+    if limit is not None or cursor:
+        scrape = cached_slice(province, name, response, limit, cursor, full_text)
+    else:
+        scrape = cached_scrape(province, name, response, full_text, defer_images, collected=collected)
+    data, outcome = await run_guarded(request, scrape, deadline)
+    if outcome == "ok":
+        return data if isinstance(data, dict) else {"results": data or []}
+    if outcome == "disconnected":
+        # Nobody is left to read this
+        return Response(status_code=499)
+    # Slices are not cut short: their nextCursor would skip the cases
+    # that were never loaded
+    if allow_partial and not (limit is not None or cursor):
+        response.headers["X-Partial"] = "deadline"
+        return {"results": collected, "partial": True}
+    return JSONResponse(status_code=504, content={
+        "error": f"Scrape did not finish within {deadline or REQUEST_DEADLINE:g}s",
+        "scraped": len(collected),
+    })
+
+
+# ----------------------------------------
+# Batch screening (POST /scrape/batch)
+# ----------------------------------------
+# Many names in one call. Each provider borrows one browser context for the
+# whole batch and runs BATCH_PAGES_PER_PROVIDER search pages ("lanes") in it;
+# a lane takes the next name and searches again on the same page, so the
+# browser, the context and CanLII's cookie consent are set up once per
+# provider instead of once per name. Names still go through the result cache.
+BATCH_MAX_NAMES = int(os.getenv("BATCH_MAX_NAMES", "100"))
+BATCH_PAGES_PER_PROVIDER = int(os.getenv("BATCH_PAGES_PER_PROVIDER", "2"))
+# Total time a batch may take; like the /scrape* endpoints it is cancelled
+# at the deadline or when the client disconnects. Names finished by then are
+# in the result cache, so a retry only crawls the rest.
+BATCH_DEADLINE = float(os.getenv("BATCH_DEADLINE", "1800"))
+
+
+class BatchRequest(BaseModel):
+    names: list[str]
+    providers: list[str] = ["all"]
+    full_text: bool = False
+    deadline: float = None
+
+
+async def batch_provider(province: str, names, full_text: bool = False):
+    config = CANLII_JURISDICTIONS.get(province)
+    provider = config["provider"] if config else "OPENROOM"
+    cache_key = f"{province}-fulltext" if full_text and config else province
+    pending = asyncio.Queue()
+    for name in names:
+        pending.put_nowait(name)
+    results, errors = {}, {}
+
+    site = "CANLII" if config else "OPENROOM"
+    started = time.perf_counter()
+    async with browser_pool.acquire(**storage_states.context_options(site)) as context:
+        observe_stage(provider, "browser", started)
+        await apply_route_policy(context, site)
+        semaphore = asyncio.Semaphore(max(1, CANLII_DETAIL_CONCURRENCY.get(provider, 4)))
+
+        def search_on(page):
+            if config:
+                return lambda name: collect_cases(
+                    iter_canlii_session(context, page, config, name, full_text, semaphore=semaphore))
+            return lambda name: collect_cases(iter_openroom_session(context, page, name))
+
+        async def lane():
+            page = await browser_pool.new_page(context, capped=False)
+            try:
+                while not pending.empty():
+                    name = pending.get_nowait()
+                    try:
+                        results[name], _, _ = await result_cache.get_or_run(cache_key, name, search_on(page))
+                    except Exception as e:
+                        print(f"[Batch] {province} failed for {name}: {e}")
+                        errors[name] = str(e)
+                        # Don't carry a broken page over to the next name
+                        await browser_pool.close_page(page)
+                        page = await browser_pool.new_page(context, capped=False)
+            finally:
+                await browser_pool.close_page(page)
+
+        lanes = min(max(1, BATCH_PAGES_PER_PROVIDER), len(names))
+        await asyncio.gather(*(lane() for _ in range(lanes)))
+    return results, errors
+
+
+# ----------------------------------------
+# Crawl jobs (POST /jobs)
+# ----------------------------------------
+# Long crawls run outside the request on a fixed worker pool. The queue is
+# bounded; when it is full POST /jobs answers 503 instead of starting more
+# browsers, which keeps memory predictable.
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "2"))
+CRAWL_QUEUE_MAXSIZE = int(os.getenv("CRAWL_QUEUE_MAXSIZE", "20"))
+CRAWL_JOB_TTL = float(os.getenv("CRAWL_JOB_TTL", "3600"))
+CRAWL_JOB_MAX_ENTRIES = int(os.getenv("CRAWL_JOB_MAX_ENTRIES", "1000"))
+
+
+class CrawlJobRequest(BaseModel):
+    provider: str
+    name: str
+
+
+class CrawlJobQueue(JobQueue):
+    ttl = CRAWL_JOB_TTL
+    max_entries = CRAWL_JOB_MAX_ENTRIES
+    log_tag = "Crawl Job"
+
+    def __init__(self, workers: int = CRAWL_WORKERS, maxsize: int = CRAWL_QUEUE_MAXSIZE):
+        super().__init__(workers, maxsize)
+
+    # Raises asyncio.QueueFull when the queue is at capacity
+    def submit(self, provider: str, name: str):
+        job = self._new_job(
+            provider=provider,
+            name=name,
+            progress={"pages": 0, "cases": 0, "pageDone": 0, "pageTotal": 0},
+            results=[],
+        )
+        self._queue.put_nowait((job["id"], ()))
+        self._jobs[job["id"]] = job
+        return job["id"]
+
+    async def _run(self, job):
+        progress = job["progress"]
+
+        async def crawl(name):
+            async for event in STREAMERS[job["provider"]](name):
+                if event["event"] == "page":
+                    progress["pages"] += 1
+                    progress["pageDone"] = 0
+                    progress["pageTotal"] = event["count"]
+                elif event["event"] == "progress":
+                    progress["pageDone"] = event["done"]
+                elif event["event"] == "case":
+                    progress["cases"] += 1
+                    job["results"].append(event["data"])
+            return job["results"]
+
+        data, cache_status, _ = await result_cache.get_or_run(job["provider"], job["name"], crawl)
+        job["results"] = data or []
+        job["cache"] = cache_status
+
+
+crawl_jobs = CrawlJobQueue()
+
+# ----------------------------------------
+# Watchlist (incremental re-checks, /watch)
+# ----------------------------------------
+# Remembers, per provider and name, every case already returned (caseUrl for
+# CanLII, the profile link for OpenRoom) with a hash of its listing fields.
+# A watch run only loads cases that are new or whose listing changed and
+# returns that delta. Every WATCHLIST_FULL_RESCAN_DAYS a run re-reads
+# everything, to catch profiles or decisions that changed without their
+# listing changing; 0 never forces a full rescan.
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", "watchlist.sqlite3")
+WATCHLIST_FULL_RESCAN_DAYS = float(os.getenv("WATCHLIST_FULL_RESCAN_DAYS", "7"))
+# Total time a /watch request may take (see run_guarded)
+WATCH_DEADLINE = float(os.getenv("WATCH_DEADLINE", "300"))
+
+OPENROOM_WATCH_FIELDS = ("tenantName", "landlord", "caseId", "address", "topic", "amountOwed")
+CANLII_WATCH_FIELDS = ("caseName", "citation", "tribunal", "date", "keywords")
+
+WATCH_CASES = Counter("watch_cases_total", "Watchlist cases by delta status.", ("provider", "status"))
+
+
+# Works on CanLII result summaries and on finished records alike, since both
+# carry the listing fields under the same names
+def watch_hash(provider: str, item: dict):
+    fields = OPENROOM_WATCH_FIELDS if provider == "OPENROOM" else CANLII_WATCH_FIELDS
+    payload = json.dumps([item.get(field) for field in fields], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def watch_key(record: dict):
+    return record.get("caseUrl") or (record.get("links") or [None])[0]
+
+
+def normalize_watch_name(name: str):
+    return " ".join(name.lower().split())
+
+
+class WatchlistStore(SqliteStore):
+    schema = """
+        CREATE TABLE IF NOT EXISTS watch_seen (
+            provider TEXT NOT NULL,
+            name TEXT NOT NULL,
+            case_key TEXT NOT NULL,
+            case_id TEXT,
+            content_hash TEXT NOT NULL,
+            first_seen REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            PRIMARY KEY (provider, name, case_key)
+        );
+        CREATE TABLE IF NOT EXISTS watch_runs (
+            provider TEXT NOT NULL,
+            name TEXT NOT NULL,
+            last_run REAL NOT NULL,
+            last_full_run REAL NOT NULL,
+            PRIMARY KEY (provider, name)
+        );
+    """
+
+    def _seen(self, provider: str, name: str):
+        rows = self._fetchall(
+            "SELECT case_key, content_hash FROM watch_seen WHERE provider = ? AND name = ?",
+            (provider, name),
+        )
+        return dict(rows)
+
+    def _last_full_run(self, provider: str, name: str):
+        row = self._fetchone(
+            "SELECT last_full_run FROM watch_runs WHERE provider = ? AND name = ?",
+            (provider, name),
+        )
+        return row[0] if row else None
+
+    def _record(self, provider: str, name: str, entries, full: bool):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                """INSERT INTO watch_seen (provider, name, case_key, case_id, content_hash, first_seen, last_seen)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (provider, name, case_key) DO UPDATE SET
+                       case_id = excluded.case_id,
+                       content_hash = excluded.content_hash,
+                       last_seen = excluded.last_seen""",
+                [(provider, name, key, case_id, digest, now, now) for key, case_id, digest in entries],
+            )
+            conn.execute(
+                """INSERT INTO watch_runs (provider, name, last_run, last_full_run) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (provider, name) DO UPDATE SET
+                       last_run = excluded.last_run,
+                       last_full_run = CASE WHEN ? THEN excluded.last_full_run ELSE watch_runs.last_full_run END""",
+                (provider, name, now, now, full),
+            )
+            conn.commit()
+
+    async def seen(self, provider: str, name: str):
+        try:
+            return await asyncio.to_thread(self._seen, provider, name)
+        except Exception as e:
+            print(f"[Watchlist] Read failed for {provider}/{name}: {e}")
+            return {}
+
+    async def last_full_run(self, provider: str, name: str):
+        try:
+            return await asyncio.to_thread(self._last_full_run, provider, name)
+        except Exception as e:
+            print(f"[Watchlist] Read failed for {provider}/{name}: {e}")
+            return None
+
+    async def record(self, provider: str, name: str, entries, full: bool):
+        try:
+            await asyncio.to_thread(self._record, provider, name, entries, full)
+        except Exception as e:
+            print(f"[Watchlist] Write failed for {provider}/{name}: {e}")
+
+
+watchlist = WatchlistStore(WATCHLIST_PATH)
+
+WATCHERS = {"ontario": ("OPENROOM", iter_openroom)}
+for _jurisdiction, _config in CANLII_JURISDICTIONS.items():
+    WATCHERS[_jurisdiction] = (_config["provider"], partial(iter_canlii, _jurisdiction))
+
+
+async def watch_scrape(province: str, name: str):
+    provider, iterate = WATCHERS[province]
+    key_name = normalize_watch_name(name)
+    known = await watchlist.seen(provider, key_name)
+    last_full = await watchlist.last_full_run(provider, key_name)
+    full = not known or last_full is None or bool(
+        WATCHLIST_FULL_RESCAN_DAYS and time.time() - last_full > WATCHLIST_FULL_RESCAN_DAYS * 86400
+    )
+
+    new, changed, unchanged, entries = [], [], 0, []
+    async for event in iterate(name, known=None if full else known):
+        if event["event"] == "page":
+            unchanged += event.get("skipped", 0)
+            continue
+        if event["event"] != "case":
+            continue
+        record = event["data"]
+        key, digest = watch_key(record), watch_hash(provider, record)
+        if key is not None and known.get(key) == digest:
+            unchanged += 1
+        elif key is not None and key in known:
+            changed.append(record)
+        else:
+            new.append(record)
+        # CanLII cases whose decision failed to load are left out so the
+        # next run tries them again (OpenRoom records have no snippet field)
+        if key is not None and record.get("fullTextSnippet", True):
+            entries.append((key, record.get("caseId") or record.get("citation"), digest))
+
+    await watchlist.record(provider, key_name, entries, full)
+    WATCH_CASES.labels(provider, "new").inc(len(new))
+    WATCH_CASES.labels(provider, "changed").inc(len(changed))
+    WATCH_CASES.labels(provider, "unchanged").inc(unchanged)
+    return {
+        "provider": provider,
+        "fullRescan": full,
+        "new": new,
+        "changed": changed,
+        "unchanged": unchanged,
+    }
+
+
 # ----------------------------------------
 # FastAPI Endpoints
 # ----------------------------------------
 @app.get("/scrape")
-async def scrape(name: str = Query(..., description="Search name (OpenRoom - Ontario)")):
+async def scrape(
+    request: Request,
+    response: Response,
+    name: str = Query(..., description="Search name (OpenRoom - Ontario)"),
+    defer_images: bool = Query(False, description="Return records now and process court-order images in the background"),
+    deadline: float = Query(None, gt=0, le=REQUEST_DEADLINE, description="Give up after this many seconds"),
+    allow_partial: bool = Query(False, alias="partial", description="On deadline, return the cases scraped so far"),
+):
     try:
-        data = await scrape_openroom(name)
-        return {"results": data or []}
+        return await guarded_scrape(request, response, "ontario", name, deadline=deadline,
+                                    allow_partial=allow_partial, defer_images=defer_images)
     except Exception as e:
         print(f"[ERROR /scrape - Ontario] {e}")
         return JSONResponse(status_code=500, content={
@@ -497,10 +3058,21 @@ async def scrape(name: str = Query(..., description="Search name (OpenRoom - Ont
         })
 
 @app.get("/scrape-quebec")
-async def scrape_quebec_endpoint(name: str = Query(..., description="Search name (CanLII - Quebec)")):
+async def scrape_quebec_endpoint(
+    request: Request,
+    response: Response,
+    name: str = Query(..., description="Search name (CanLII - Quebec)"),
+    full_text: bool = Query(False, description="Also return the whole decision text"),
+    limit: int = Query(None, ge=1, le=CANLII_MAX_LIMIT, description="Stop after this many cases and return a nextCursor"),
+    cursor: str = Query(None, description="nextCursor of the previous slice"),
+    deadline: float = Query(None, gt=0, le=REQUEST_DEADLINE, description="Give up after this many seconds"),
+    allow_partial: bool = Query(False, alias="partial", description="On deadline, return the cases scraped so far"),
+):
     try:
-        data = await scrape_quebec(name)
-        return {"results": data or []}
+        return await guarded_scrape(request, response, "quebec", name, full_text, limit, cursor,
+                                    deadline, allow_partial)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[ERROR /scrape-quebec] {e}")
         return JSONResponse(status_code=500, content={
@@ -509,10 +3081,21 @@ async def scrape_quebec_endpoint(name: str = Query(..., description="Search name
         })
 
 @app.get("/scrape-alberta")
-async def scrape_alberta_endpoint(name: str = Query(..., description="Search name (CanLII - Alberta)")):
+async def scrape_alberta_endpoint(
+    request: Request,
+    response: Response,
+    name: str = Query(..., description="Search name (CanLII - Alberta)"),
+    full_text: bool = Query(False, description="Also return the whole decision text"),
+    limit: int = Query(None, ge=1, le=CANLII_MAX_LIMIT, description="Stop after this many cases and return a nextCursor"),
+    cursor: str = Query(None, description="nextCursor of the previous slice"),
+    deadline: float = Query(None, gt=0, le=REQUEST_DEADLINE, description="Give up after this many seconds"),
+    allow_partial: bool = Query(False, alias="partial", description="On deadline, return the cases scraped so far"),
+):
     try:
-        data = await scrape_alberta(name)
-        return {"results": data or []}
+        return await guarded_scrape(request, response, "alberta", name, full_text, limit, cursor,
+                                    deadline, allow_partial)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[ERROR /scrape-alberta] {e}")
         return JSONResponse(status_code=500, content={
@@ -521,10 +3104,21 @@ async def scrape_alberta_endpoint(name: str = Query(..., description="Search nam
         })
 
 @app.get("/scrape-bc")
-async def scrape_bc_endpoint(name: str = Query(..., description="Search name (CanLII - British Columbia)")):
+async def scrape_bc_endpoint(
+    request: Request,
+    response: Response,
+    name: str = Query(..., description="Search name (CanLII - British Columbia)"),
+    full_text: bool = Query(False, description="Also return the whole decision text"),
+    limit: int = Query(None, ge=1, le=CANLII_MAX_LIMIT, description="Stop after this many cases and return a nextCursor"),
+    cursor: str = Query(None, description="nextCursor of the previous slice"),
+    deadline: float = Query(None, gt=0, le=REQUEST_DEADLINE, description="Give up after this many seconds"),
+    allow_partial: bool = Query(False, alias="partial", description="On deadline, return the cases scraped so far"),
+):
     try:
-        data = await scrape_british_columbia(name)
-        return {"results": data or []}
+        return await guarded_scrape(request, response, "bc", name, full_text, limit, cursor,
+                                    deadline, allow_partial)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[ERROR /scrape-bc] {e}")
         return JSONResponse(status_code=500, content={
@@ -533,33 +3127,230 @@ async def scrape_bc_endpoint(name: str = Query(..., description="Search name (Ca
         })
     
 
+def encode_stream_event(event: dict, fmt: str) -> str:
+    payload = json.dumps(event, ensure_ascii=False)
+    if fmt == "sse":
+        return f"event: {event['event']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+@app.get("/scrape-stream")
+async def scrape_stream(
+    name: str = Query(..., description="Search name"),
+    province: str = Query("ontario", enum=list(STREAMERS)),
+    format: str = Query("ndjson", enum=["ndjson", "sse"]),
+    full_text: bool = Query(False, description="Also return the whole decision text"),
+):
+    province = province.lower() if province.lower() in STREAMERS else "ontario"
+    fmt = "sse" if format.lower() == "sse" else "ndjson"
+    if full_text and province in CANLII_JURISDICTIONS:
+        events = iter_canlii(province, name, full_text=True)
+    else:
+        events = STREAMERS[province](name)
+
+    async def body():
+        count = 0
+        try:
+            async for event in events:
+                if event["event"] == "case":
+                    count += 1
+                yield encode_stream_event(event, fmt)
+            yield encode_stream_event({"event": "done", "province": province, "count": count}, fmt)
+        except Exception as e:
+            print(f"[ERROR /scrape-stream for province={province}] {e}")
+            yield encode_stream_event({"event": "error", "province": province, "count": count, "details": str(e)}, fmt)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if fmt == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def create_crawl_job(job: CrawlJobRequest):
+    provider = job.provider.lower()
+    if provider not in STREAMERS:
+        raise HTTPException(status_code=400, detail=f"Unknown provider '{job.provider}', expected one of {sorted(STREAMERS)}")
+    try:
+        job_id = crawl_jobs.submit(provider, job.name)
+    except asyncio.QueueFull:
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": "30"},
+            content={"error": "Crawl queue is full, retry later"},
+        )
+    return {"jobId": job_id, "status": "queued", "statusUrl": f"/jobs/{job_id}"}
+
+
+@app.post("/scrape/batch")
+async def scrape_batch(request: Request, batch: BatchRequest):
+    names = list(dict.fromkeys(" ".join(name.split()) for name in batch.names if name.strip()))
+    if not names:
+        raise HTTPException(status_code=400, detail="No names given")
+    if len(names) > BATCH_MAX_NAMES:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_NAMES} names per batch")
+    requested = [p.lower() for p in batch.providers]
+    provinces = list(SCRAPERS) if "all" in requested else list(dict.fromkeys(requested))
+    unknown = [p for p in provinces if p not in SCRAPERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown providers {unknown}, expected any of {sorted(SCRAPERS)} or 'all'")
+    if batch.deadline is not None and not 0 < batch.deadline <= BATCH_DEADLINE:
+        raise HTTPException(status_code=400, detail=f"deadline must be between 0 and {BATCH_DEADLINE:g} seconds")
+
+    deadline = batch.deadline or BATCH_DEADLINE
+    outcomes, outcome = await run_guarded(request, asyncio.gather(
+        *(batch_provider(p, names, batch.full_text) for p in provinces), return_exceptions=True
+    ), deadline)
+    if outcome == "disconnected":
+        return Response(status_code=499)
+    if outcome == "deadline":
+        return JSONResponse(status_code=504, content={
+            "error": f"Batch did not finish within {deadline:g}s; finished names are cached, retry for the rest"})
+    results = {name: {} for name in names}
+    errors = {}
+    for province, outcome in zip(provinces, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"[ERROR /scrape/batch for province={province}] {outcome}")
+            for name in names:
+                errors.setdefault(name, {})[province] = str(outcome)
+            continue
+        found, failed = outcome
+        for name, data in found.items():
+            results[name][province] = data or []
+        for name, error in failed.items():
+            errors.setdefault(name, {})[province] = error
+
+    response = {"results": results}
+    if errors:
+        response["errors"] = errors
+    return response
+
+
+@app.get("/jobs/{job_id}")
+async def get_crawl_job(job_id: str):
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job
+
+
+# Delta since the last watch of this name: only new or changed cases are
+# returned. Not served from the result cache, since every run moves the
+# watchlist forward.
+@app.get("/watch")
+async def watch(
+    request: Request,
+    name: str,
+    province: str = Query("all", enum=[*WATCHERS, "all"]),
+    deadline: float = Query(None, gt=0, le=WATCH_DEADLINE, description="Give up after this many seconds"),
+):
+    key = province.lower()
+    provinces = list(WATCHERS) if key == "all" else [key if key in WATCHERS else "ontario"]
+    deadline = deadline or WATCH_DEADLINE
+    outcomes, outcome = await run_guarded(request, asyncio.gather(
+        *(watch_scrape(p, name) for p in provinces), return_exceptions=True
+    ), deadline)
+    if outcome == "disconnected":
+        return Response(status_code=499)
+    if outcome == "deadline":
+        return JSONResponse(status_code=504, content={"error": f"Watch run did not finish within {deadline:g}s"})
+    results, errors = {}, {}
+    for p, outcome in zip(provinces, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"[ERROR /watch for province={p}] {outcome}")
+            errors[p] = str(outcome)
+        else:
+            results[p] = outcome
+    response = {"name": name, "results": results}
+    if errors:
+        response["errors"] = errors
+    return response
+
+
+@app.get("/images/{job_id}")
+async def image_job_status(job_id: str):
+    job = image_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired image job")
+    return job
+
+
+@app.get("/health")
+async def health():
+    return {
+        "browserPool": await browser_pool.health(),
+        "routePolicies": {name: policy.stats() for name, policy in ROUTE_POLICIES.items()},
+        "waits": wait_stats(),
+        "uploads": dict(cloudinary_uploader.stats),
+        "imageJobs": image_jobs.stats(),
+        "crawlJobs": crawl_jobs.stats(),
+        "hosts": host_scheduler.stats(),
+        "deepLinks": deep_links.stats(),
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/")               
 async def root():
     return {
         "message": "Welcome to crawl4ai API. Use /scrape, /scrape-all, or a province-specific route to get started.",
         "endpoints": [
             "/scrape?name=",
+            "/scrape?name=&defer_images=true",
+            "/scrape?name=&deadline=&partial=true",
+            "/images/{job_id}",
+            "POST /jobs",
+            "POST /scrape/batch",
+            "/jobs/{job_id}",
             "/scrape-all?name=&province=",
+            "/scrape-all?name=&province=all",
             "/scrape-quebec?name=",
             "/scrape-alberta?name=",
-            "/scrape-bc?name="
+            "/scrape-bc?name=",
+            "/scrape-bc?name=&limit=&cursor=",
+            "/scrape-stream?name=&province=&format=ndjson|sse",
+            "/watch?name=&province=",
+            "/health",
+            "/metrics"
         ]
     }
 
 
 @app.get("/scrape-all")
-async def scrape_all(name: str, province: str = Query("ontario", enum=["ontario", "quebec", "alberta", "bc"])):
+async def scrape_all(
+    request: Request,
+    response: Response,
+    name: str,
+    province: str = Query("ontario", enum=[*SCRAPERS, "all"]),
+    deadline: float = Query(None, gt=0, le=REQUEST_DEADLINE, description="Give up after this many seconds"),
+    allow_partial: bool = Query(False, alias="partial", description="On deadline, return the cases scraped so far"),
+):
     try:
-        if province.lower() == "quebec":
-            data = await scrape_quebec(name)
-        elif province.lower() == "alberta":
-            data = await scrape_alberta(name)
-        elif province.lower() == "bc":
-            data = await scrape_british_columbia(name)
-        else:
-            data = await scrape_openroom(name)
-        return {"results": data or []}
-        
+        key = province.lower()
+        if key == "all":
+            # Every provider stops at min(request deadline, its own deadline)
+            # and reports what it had by then, so the fan-out always returns
+            # per-provider partial results; the outer guard only catches a
+            # provider that doesn't unwind within the grace period.
+            request_deadline = deadline or REQUEST_DEADLINE
+            data, outcome = await run_guarded(request, scrape_fanout(name, request_deadline),
+                                              request_deadline + FANOUT_DEADLINE_GRACE)
+            if outcome == "disconnected":
+                return Response(status_code=499)
+            if outcome == "deadline":
+                return JSONResponse(status_code=504, content={
+                    "error": f"Scrape did not finish within {request_deadline:g}s"})
+            if any(status["status"] == "timeout" for status in data["providers"].values()):
+                response.headers["X-Partial"] = "deadline"
+            return data
+        return await guarded_scrape(request, response, key if key in SCRAPERS else "ontario", name,
+                                    deadline=deadline, allow_partial=allow_partial)
+
     except Exception as e:
         print(f"[ERROR /scrape-all for province={province}] {e}")
         return JSONResponse(status_code=500, content={
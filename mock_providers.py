@@ -0,0 +1,234 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+# Local stand-in for openroom.ca, canlii.org and the Cloudinary upload API,
+# built from the saved pages in fixtures/. Point the app at it with
+#
+#   python mock_providers.py --port 8765 --latency-ms 50
+#   OPENROOM_BASE_URL=http://127.0.0.1:8765 \
+#   CANLII_BASE_URL=http://127.0.0.1:8765 \
+#   CLOUDINARY_UPLOAD_URL=http://127.0.0.1:8765/cloudinary/v1_1/mock/image/upload \
+#   uvicorn main:app
+#
+# Search results are generated per query (the query goes into every case and
+# decision URL, so a new name is never served from the decision store or the
+# upload index). GET /__stats returns request counts per kind.
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+CANLII_ROOTS = {"/qc": "qc", "/en/ab": "ab", "/en/bc": "bc"}
+CANLII_JURISDICTION_ROOTS = {"qc": "/qc", "ab": "/en/ab", "bc": "/en/bc"}
+
+# CanLII's search app reads the query from the URL fragment
+# (/en/#search/type=decision&jId=bc&text=...); the mock sends it on to the
+# matching results page.
+CANLII_SEARCH_APP = """<!DOCTYPE html><html><body><script>
+const params = new URLSearchParams(location.hash.replace(/^#search\\//, ''));
+const roots = %s;
+const root = roots[params.get('jId')];
+if (root) location.replace(root + '/search?text=' + encodeURIComponent(params.get('text') || '') + '&type=' + (params.get('type') || '') + '&page=1');
+</script></body></html>"""
+# Queries containing this get CanLII's "no results" page
+NO_HITS_MARKER = "nohits"
+CANLII_DECISION_FIXTURES = {"qc": "qc_decision_fr.html", "ab": "bc_decision_en.html", "bc": "bc_decision_en.html"}
+
+# 1x1 PNG; each served image gets its path appended after IEND so the
+# uploader's content hash differs per image like real court orders would
+PNG_1X1 = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082"
+)
+
+# Opens the court-order panel the way OpenRoom's client code does
+OPENROOM_COURT_ORDER_WIDGET = """
+<div class="mt-4"><button type="button"><span>View court order</span></button></div>
+<script>
+document.querySelector('button span').parentElement.addEventListener('click', () => {
+    const panel = document.createElement('div');
+    panel.className = 'mt-2 flex flex-col gap-y-2';
+    panel.innerHTML = %s;
+    document.body.appendChild(panel);
+});
+</script>
+"""
+
+
+def _read_fixture(*parts):
+    with open(os.path.join(FIXTURES_DIR, *parts), encoding="utf-8") as f:
+        return f.read()
+
+
+def _slug(value: str):
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "query"
+
+
+class MockProviders:
+    def __init__(self, latency_ms: int = 0, results_per_page: int = 10, result_pages: int = 3, images_per_case: int = 2):
+        self.latency = latency_ms / 1000
+        self.results_per_page = results_per_page
+        self.result_pages = result_pages
+        self.images_per_case = images_per_case
+        self.openroom_case_html = _read_fixture("openroom", "case_full.html")
+        self.decisions = {key: _read_fixture("canlii", name) for key, name in CANLII_DECISION_FIXTURES.items()}
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def count(self, kind: str):
+        with self._lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+    # --- OpenRoom ---
+    def openroom_search_form(self):
+        return """<!DOCTYPE html><html><head><title>OpenRoom</title></head><body>
+<form action="/documents/search" method="get"><input id="search-dropdown" name="q" type="search"></form>
+</body></html>"""
+
+    def openroom_results(self, query: str):
+        slug = _slug(query)
+        links = "".join(
+            f'<a class="w-full" href="/documents/profile/{slug}-{i}">Case {i}</a>'
+            for i in range(1, self.results_per_page + 1)
+        )
+        return (f"<!DOCTYPE html><html><body><input id='search-dropdown' value='{html.escape(query, quote=True)}'>"
+                f"<div id='results'>{links}</div></body></html>")
+
+    def openroom_case(self, case_id: str):
+        images = "".join(f'<img src="/media/{case_id}-{k}.png">' for k in range(1, self.images_per_case + 1))
+        widget = OPENROOM_COURT_ORDER_WIDGET % json.dumps(images)
+        page = self.openroom_case_html.replace("TNL-12345-22", f"TNL-{case_id}")
+        return page.replace("</body>", widget + "</body>")
+
+    # --- CanLII ---
+    def canlii_search_form(self, root: str):
+        return f"""<!DOCTYPE html><html><head><title>CanLII</title></head><body>
+<form action="{root}/search" method="get"><input id="idInput" name="text" type="text"></form>
+</body></html>"""
+
+    def canlii_results(self, root: str, query: str, page: int, decisions_only: bool):
+        slug = _slug(query)
+        base = f"{root}/search?text={quote(query)}"
+        if NO_HITS_MARKER in query.lower():
+            return (f'<!DOCTYPE html><html><body><input id="idInput" value="{html.escape(query)}">'
+                    '<div id="noResults">No results found.</div></body></html>')
+        items = []
+        for i in range(1, self.results_per_page + 1):
+            n = (page - 1) * self.results_per_page + i
+            items.append(f"""<li class="result">
+<span class="name"><a href="{root}/doc/{slug}/{n}.html">{html.escape(query)} v. Landlord {n}</a></span>
+<span class="reference">2024 MOCK {n}</span>
+<span class="context">Mock Tribunal</span><span class="context">2024-01-{(n % 28) + 1:02d}</span>
+<span class="keywords">rent — arrears — eviction</span></li>""")
+        facet = f'<ul><li id="typeFacetItem-decision"><a href="{base}&type=decision&page=1">Decisions</a></li></ul>'
+        next_link = ""
+        if decisions_only and page < self.result_pages:
+            next_link = f'<a class="next" href="{base}&type=decision&page={page + 1}">Next</a>'
+        return f"<!DOCTYPE html><html><body>{facet}<ul>{''.join(items)}</ul>{next_link}</body></html>"
+
+    def route(self, method: str, path: str, query: dict):
+        # Returns (status, content_type, body, kind)
+        if method == "POST" and path.startswith("/cloudinary/"):
+            return 200, "application/json", None, "upload"
+        if path == "/__stats":
+            return 200, "application/json", json.dumps(self.stats()), None
+        if path == "/documents":
+            if "search" in query:
+                return 200, "text/html", self.openroom_results(query["search"][0]), "search"
+            return 200, "text/html", self.openroom_search_form(), "search"
+        if path == "/documents/search":
+            return 200, "text/html", self.openroom_results(query.get("q", [""])[0]), "search"
+        if path.startswith("/documents/profile/"):
+            return 200, "text/html", self.openroom_case(path.rsplit("/", 1)[-1]), "case"
+        if path.startswith("/media/"):
+            return 200, "image/png", PNG_1X1 + path.encode(), "image"
+        if path in ("/en", "/en/", "/fr", "/fr/"):
+            return 200, "text/html", CANLII_SEARCH_APP % json.dumps(CANLII_JURISDICTION_ROOTS), "search"
+        for root, key in CANLII_ROOTS.items():
+            if path in (root, root + "/"):
+                return 200, "text/html", self.canlii_search_form(root), "search"
+            if path == root + "/search":
+                page = int(query.get("page", ["1"])[0])
+                decisions_only = query.get("type", [""])[0] == "decision"
+                return 200, "text/html", self.canlii_results(root, query.get("text", [""])[0], page, decisions_only), "search"
+            if path.startswith(root + "/doc/"):
+                return 200, "text/html", self.decisions[key], "decision"
+        return 404, "text/plain", "not found", None
+
+
+def make_handler(mock: MockProviders):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, method: str):
+            parsed = urlparse(self.path)
+            status, content_type, body, kind = mock.route(method, parsed.path, parse_qs(parsed.query))
+            if kind == "upload":
+                length = int(self.headers.get("Content-Length") or 0)
+                digest = hashlib.sha256(self.rfile.read(length)).hexdigest()[:16]
+                host = self.headers.get("Host", "127.0.0.1")
+                body = json.dumps({"secure_url": f"http://{host}/cloudinary/image/{digest}.png"})
+            if kind:
+                mock.count(kind)
+            if mock.latency:
+                time.sleep(mock.latency)
+            data = body if isinstance(body, bytes) else body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type + ("; charset=utf-8" if content_type.startswith("text/") else ""))
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._respond("GET")
+
+        def do_POST(self):
+            self._respond("POST")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_mock_server(mock: MockProviders, host: str = "127.0.0.1", port: int = 0):
+    # Serves from a daemon thread; returns (server, base_url)
+    server = ThreadingHTTPServer((host, port), make_handler(mock))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--results", type=int, default=10, help="Results per search page")
+    parser.add_argument("--pages", type=int, default=3, help="CanLII results pages per search")
+    parser.add_argument("--images", type=int, default=2, help="Court-order images per OpenRoom case")
+    args = parser.parse_args()
+
+    mock = MockProviders(args.latency_ms, args.results, args.pages, args.images)
+    server, base_url = start_mock_server(mock, args.host, args.port)
+    print(f"[Mock] Serving OpenRoom, CanLII and Cloudinary on {base_url}")
+    print(f"  OPENROOM_BASE_URL={base_url}")
+    print(f"  CANLII_BASE_URL={base_url}")
+    print(f"  CLOUDINARY_UPLOAD_URL={base_url}/cloudinary/v1_1/mock/image/upload")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# main opens its SQLite stores and reads its configuration at import time;
+# keep both away from the working tree
+_workdir = tempfile.mkdtemp(prefix="crawl4ai-tests-")
+os.environ.setdefault("DOCUMENT_STORE_PATH", os.path.join(_workdir, "decisions.sqlite3"))
+os.environ.setdefault("UPLOAD_INDEX_PATH", os.path.join(_workdir, "uploads.sqlite3"))
+os.environ.setdefault("WATCHLIST_PATH", os.path.join(_workdir, "watchlist.sqlite3"))
+os.environ.setdefault("STORAGE_STATE_DIR", os.path.join(_workdir, "storage_state"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Runs check(page) on a fresh headless Chromium page that can't reach the
+# network; skips the test where Playwright's Chromium isn't installed
+@pytest.fixture
+def run_in_page():
+    from playwright.async_api import async_playwright
+    from main import BROWSER_LAUNCH_ARGS
+
+    def run(check):
+        async def main():
+            async with async_playwright() as p:
+                try:
+                    browser = await p.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
+                except Exception as e:
+                    pytest.skip(f"Chromium is not available: {str(e).splitlines()[0]}")
+                try:
+                    page = await browser.new_page()
+                    await page.route("**/*", lambda route: route.abort())
+                    return await check(page)
+                finally:
+                    await browser.close()
+
+        return asyncio.run(main())
+
+    return run
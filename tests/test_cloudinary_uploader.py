@@ -0,0 +1,140 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from main import CloudinaryUploader, UploadIndex
+
+
+# Local stand-in for the Cloudinary upload endpoint. Each POST takes the next
+# scripted reply: an HTTP status, or ("sleep", seconds) to answer 200 late;
+# once the script is used up every POST succeeds.
+class StubCloudinary:
+    def __init__(self, script=(), delay: float = 0):
+        self.script = list(script)
+        self.delay = delay
+        self.posts = 0
+        self._lock = threading.Lock()
+
+    def next_reply(self):
+        with self._lock:
+            self.posts += 1
+            return self.script.pop(0) if self.script else 200
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                reply = stub.next_reply()
+                time.sleep(stub.delay)
+                if isinstance(reply, tuple):
+                    time.sleep(reply[1])
+                    reply = 200
+                body = json.dumps({"secure_url": f"https://stub/image/{stub.posts}.png"}).encode()
+                try:
+                    self.send_response(reply)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(script=(), delay: float = 0):
+        cloudinary = StubCloudinary(script, delay)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), cloudinary.handler())
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return cloudinary, f"http://127.0.0.1:{server.server_address[1]}/v1_1/stub/image/upload"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def make_uploader(url: str, index_path: str, **kwargs):
+    kwargs.setdefault("retry_delay", 0.01)
+    return CloudinaryUploader(upload_url=url, index=UploadIndex(index_path), **kwargs)
+
+
+def test_retries_after_server_error(stub, tmp_path):
+    cloudinary, url = stub(script=[503, 502])
+
+    async def run():
+        uploader = make_uploader(url, str(tmp_path / "uploads.sqlite3"), retries=3)
+        try:
+            return await uploader.upload(b"court order"), uploader.stats
+        finally:
+            await uploader.close()
+
+    secure_url, stats = asyncio.run(run())
+    assert secure_url == "https://stub/image/3.png"
+    assert cloudinary.posts == 3
+    assert stats["retries"] == 2 and stats["uploaded"] == 1
+
+
+def test_retries_after_timeout(stub, tmp_path):
+    cloudinary, url = stub(script=[("sleep", 1.0)])
+
+    async def run():
+        uploader = make_uploader(url, str(tmp_path / "uploads.sqlite3"), retries=2, timeout=0.3)
+        try:
+            return await uploader.upload(b"court order"), uploader.stats
+        finally:
+            await uploader.close()
+
+    secure_url, stats = asyncio.run(run())
+    assert secure_url == "https://stub/image/2.png"
+    assert cloudinary.posts == 2
+    assert stats["retries"] == 1
+
+
+def test_concurrent_identical_bytes_post_once(stub, tmp_path):
+    cloudinary, url = stub(delay=0.2)
+
+    async def run():
+        uploader = make_uploader(url, str(tmp_path / "uploads.sqlite3"))
+        try:
+            return await asyncio.gather(*(uploader.upload(b"same image") for _ in range(5))), uploader.stats
+        finally:
+            await uploader.close()
+
+    urls, stats = asyncio.run(run())
+    assert cloudinary.posts == 1
+    assert set(urls) == {"https://stub/image/1.png"}
+    assert stats["uploaded"] == 1 and stats["deduplicated"] == 4
+
+
+def test_upload_index_survives_restart(stub, tmp_path):
+    cloudinary, url = stub()
+    index_path = str(tmp_path / "uploads.sqlite3")
+
+    async def upload_once():
+        uploader = make_uploader(url, index_path)
+        try:
+            return await uploader.upload(b"court order"), uploader.stats
+        finally:
+            await uploader.close()
+
+    first_url, _ = asyncio.run(upload_once())
+    # A new uploader on the same index file, as after a process restart
+    second_url, stats = asyncio.run(upload_once())
+    assert second_url == first_url
+    assert cloudinary.posts == 1
+    assert stats["deduplicated"] == 1 and stats["uploaded"] == 0
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from check_fetch_parity import FIXTURES_DIR, browser_text
+from main import clean_text_preserve_meaning, parse_decision_html
+
+
+def read_fixture(name: str):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+FIXTURES = sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith(".html"))
+
+
+@pytest.mark.parametrize("fixture, opening, closing", [
+    ("bc_decision_en.html", "Civil Resolution Tribunal Date Issued: November 18, 2022", "post-judgment interest, as applicable."),
+    ("qc_decision_fr.html", "TRIBUNAL ADMINISTRATIF DU LOGEMENT Bureau de Montréal", "CONDAMNE le locataire à payer"),
+])
+def test_static_parser_reads_the_decision(fixture, opening, closing):
+    text = clean_text_preserve_meaning(parse_decision_html(read_fixture(fixture)))
+    assert text.startswith(opening)
+    assert closing in text
+    # Page chrome, scripts and styles outside #originalDocument stay out
+    for chrome in ("dataLayer", "trackPageView", "margin:", "© CanLII", "googletagmanager"):
+        assert chrome not in text
+
+
+def test_static_parser_returns_none_without_a_document():
+    assert parse_decision_html(read_fixture("no_document.html")) is None
+
+
+# The static parser and the in-page snippet must both match what Chromium's
+# innerText gives after cleaning
+@pytest.mark.parametrize("fixture", FIXTURES)
+def test_static_and_in_page_text_match_chromium(run_in_page, fixture):
+    html = read_fixture(fixture)
+    browser_raw, in_page_snippet = run_in_page(lambda page: browser_text(page, html))
+    static_raw = parse_decision_html(html)
+
+    if browser_raw is None:
+        assert static_raw is None
+        return
+    expected = clean_text_preserve_meaning(browser_raw)
+    assert clean_text_preserve_meaning(static_raw) == expected
+    assert in_page_snippet == expected
@@ -0,0 +1,65 @@
+import asyncio
+
+from main import JobQueue
+
+
+class GatedQueue(JobQueue):
+    max_entries = 2
+
+    def __init__(self):
+        super().__init__(workers=1, maxsize=10)
+        self.release = asyncio.Event()
+
+    def submit(self, fail: bool = False):
+        job = self._new_job()
+        self._jobs[job["id"]] = job
+        self._queue.put_nowait((job["id"], (fail,)))
+        return job["id"]
+
+    async def _run(self, job, fail):
+        await self.release.wait()
+        if fail:
+            raise RuntimeError("boom")
+
+
+def test_only_finished_jobs_are_evicted():
+    async def run():
+        jobs = GatedQueue()
+        try:
+            # One running and two queued jobs, already over max_entries
+            pending = [jobs.submit() for _ in range(3)]
+            await asyncio.sleep(0.01)
+            extra = jobs.submit()
+            statuses = [jobs.get(job_id)["status"] for job_id in pending + [extra]]
+
+            jobs.release.set()
+            await jobs._queue.join()
+            # The next submit drops finished jobs, oldest first, down to max_entries
+            last = jobs.submit()
+            return statuses, pending + [extra], last, jobs
+        finally:
+            await jobs.stop()
+
+    statuses, earlier, last, jobs = asyncio.run(run())
+    assert statuses == ["running", "queued", "queued", "queued"]
+    assert [jobs.get(job_id) is not None for job_id in earlier] == [False, False, True, True]
+    assert jobs.get(last) is not None
+
+
+def test_finished_jobs_expire_after_ttl():
+    async def run():
+        jobs = GatedQueue()
+        jobs.ttl = 0
+        jobs.release.set()
+        try:
+            done, failed = jobs.submit(), jobs.submit(fail=True)
+            await jobs._queue.join()
+            outcomes = jobs.get(done)["status"], jobs.get(failed)["status"], jobs.get(failed)["error"]
+            jobs.submit()
+            return outcomes, jobs.get(done), jobs.get(failed)
+        finally:
+            await jobs.stop()
+
+    outcomes, done, failed = asyncio.run(run())
+    assert outcomes == ("done", "failed", "boom")
+    assert done is None and failed is None
@@ -0,0 +1,17 @@
+from fastapi.testclient import TestClient
+
+from main import SCRAPER_TIMEOUTS, WAIT_SECONDS, app
+
+
+def test_metrics_exposition():
+    SCRAPER_TIMEOUTS.labels("CANLII", "facet").inc()
+    WAIT_SECONDS.labels("canlii.facet", "ok").observe(0.3)
+    text = TestClient(app).get("/metrics").text
+
+    assert 'scraper_timeouts_total{provider="CANLII",stage="facet"}' in text
+    assert 'scraper_wait_seconds_bucket{le="0.5",outcome="ok",step="canlii.facet"} 1.0' in text
+    # Running totals kept by the uploader and the route policies are counters
+    assert "# TYPE cloudinary_uploads_total counter" in text
+    assert "# TYPE route_policy_requests_total counter" in text
+    assert 'cloudinary_uploads_total{outcome="uploaded"}' in text
+    assert "# TYPE browser_pool_browsers gauge" in text
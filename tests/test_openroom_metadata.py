@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from bench_openroom_metadata import FIXTURES_DIR, LEGACY_METADATA_JS
+from main import OPENROOM_FIELDS, OPENROOM_METADATA_JS
+
+FIXTURES = sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith(".html"))
+
+
+# The single-pass extraction must give the same values as the original
+# per-label script on every saved case page
+@pytest.mark.parametrize("fixture", FIXTURES)
+def test_metadata_matches_legacy_script(run_in_page, fixture):
+    with open(os.path.join(FIXTURES_DIR, fixture), encoding="utf-8") as f:
+        html = f.read()
+
+    async def extract(page):
+        await page.set_content(html, wait_until="domcontentloaded")
+        return await page.evaluate(LEGACY_METADATA_JS), await page.evaluate(OPENROOM_METADATA_JS, OPENROOM_FIELDS)
+
+    expected, result = run_in_page(extract)
+    assert result["values"] == expected
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from main import MemoryCacheBackend, ResultCache
+
+
+class CountingScraper:
+    def __init__(self, result=("case",), delay: float = 0.05, error: Exception = None):
+        self.result = list(result)
+        self.delay = delay
+        self.error = error
+        self.runs = 0
+
+    async def __call__(self, name):
+        self.runs += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [f"{record} for {name}" for record in self.result]
+
+
+def make_cache(**kwargs):
+    return ResultCache(MemoryCacheBackend(), **kwargs)
+
+
+def test_concurrent_calls_share_one_crawl():
+    async def run():
+        cache, scraper = make_cache(), CountingScraper()
+        outcomes = await asyncio.gather(*(cache.get_or_run("bc", "Jane  DOE", scraper) for _ in range(5)))
+        again = await cache.get_or_run("bc", "jane doe", scraper)
+        return scraper.runs, outcomes, again
+
+    runs, outcomes, again = asyncio.run(run())
+    assert runs == 1
+    assert sorted(status for _, status, _ in outcomes) == ["COALESCED"] * 4 + ["MISS"]
+    assert all(value == ["case for Jane  DOE"] for value, _, _ in outcomes)
+    assert again[1] == "HIT"
+
+
+def test_waiter_takes_over_when_owner_is_cancelled():
+    async def run():
+        cache, scraper = make_cache(), CountingScraper(delay=0.2)
+        owner = asyncio.create_task(cache.get_or_run("bc", "x", scraper))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_run("bc", "x", scraper))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        return await asyncio.gather(owner, waiter, return_exceptions=True), scraper.runs
+
+    (owner, waiter), runs = asyncio.run(run())
+    assert isinstance(owner, asyncio.CancelledError)
+    assert waiter == (["case for x"], "MISS", 0)
+    assert runs == 2
+
+
+def test_cancelled_waiter_does_not_start_a_second_crawl():
+    async def run():
+        cache, scraper = make_cache(), CountingScraper(delay=0.2)
+        owner = asyncio.create_task(cache.get_or_run("bc", "x", scraper))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_run("bc", "x", scraper))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        waiter.cancel()
+        return await asyncio.gather(owner, waiter, return_exceptions=True), scraper.runs
+
+    outcomes, runs = asyncio.run(run())
+    assert all(isinstance(outcome, asyncio.CancelledError) for outcome in outcomes)
+    assert runs == 1
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    async def run():
+        cache, failing = make_cache(), CountingScraper(error=RuntimeError("CanLII down"))
+        outcomes = await asyncio.gather(*(cache.get_or_run("bc", "x", failing) for _ in range(3)),
+                                        return_exceptions=True)
+        recovered = await cache.get_or_run("bc", "x", CountingScraper())
+        return failing.runs, outcomes, recovered
+
+    runs, outcomes, recovered = asyncio.run(run())
+    assert runs == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert recovered[1] == "MISS"
+
+
+@pytest.mark.parametrize("result", [
+    [],
+    [{"caseUrl": "https://www.canlii.org/en/bc/doc/1.html", "fullTextSnippet": ""}],
+])
+def test_empty_or_degraded_results_use_the_negative_ttl(result):
+    async def run(negative_ttl):
+        cache = make_cache(ttl=900, negative_ttl=negative_ttl)
+
+        async def scraper(name):
+            return result
+
+        await cache.get_or_run("bc", "x", scraper)
+        return (await cache.get_or_run("bc", "x", scraper))[1]
+
+    assert asyncio.run(run(0)) == "MISS"
+    assert asyncio.run(run(60)) == "HIT"
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from bench_snippets import build_corpus, legacy_clean_text_preserve_meaning
+from main import clean_text_preserve_meaning
+
+# pytest-benchmark version of bench_snippets.py: each synthetic decision is
+# timed with the current extractor and the original regex version, grouped
+# per decision so the report compares them side by side; MB/s goes into
+# extra_info.
+#
+#   pytest tests/test_snippet_benchmark.py --benchmark-only
+#   pytest tests/test_snippet_benchmark.py --benchmark-only --benchmark-json=snippets.json
+CORPUS = build_corpus([100, 500])
+EXTRACTORS = {"new": clean_text_preserve_meaning, "legacy": legacy_clean_text_preserve_meaning}
+
+
+@pytest.mark.parametrize("extractor", list(EXTRACTORS))
+@pytest.mark.parametrize("label, text", CORPUS, ids=[label for label, _ in CORPUS])
+def test_snippet_throughput(benchmark, extractor, label, text):
+    benchmark.group = label
+    result = benchmark(EXTRACTORS[extractor], text)
+
+    assert result == legacy_clean_text_preserve_meaning(text)
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+    benchmark.extra_info["megabytes"] = round(megabytes, 3)
+    if benchmark.stats is not None:
+        benchmark.extra_info["mbPerSecond"] = round(megabytes / benchmark.stats.stats.mean, 1)
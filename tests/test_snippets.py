@@ -0,0 +1,19 @@
+import pytest
+
+from bench_snippets import build_corpus, fuzz, legacy_clean_text_preserve_meaning
+from main import clean_text_preserve_meaning
+
+
+# Random short texts made of the anchors, terminators and whitespace the
+# extractor cares about; fuzz() prints the first mismatch it finds
+@pytest.mark.parametrize("seed", [11, 12, 13])
+def test_fuzz_matches_legacy(seed):
+    assert fuzz(3000, seed=seed)
+
+
+CORPUS = build_corpus([20, 200])
+
+
+@pytest.mark.parametrize("text", [text for _, text in CORPUS], ids=[label for label, _ in CORPUS])
+def test_corpus_matches_legacy(text):
+    assert clean_text_preserve_meaning(text) == legacy_clean_text_preserve_meaning(text)